@@ -5,6 +5,7 @@ from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
+from employee_system.db_routing import replica_reads
 from .serializers import UserSerializer, LoginSerializer
 
 @api_view(['POST'])
@@ -77,6 +78,7 @@ def logout_view(request):
         )
 
 
+@replica_reads
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def user_profile(request):
@@ -0,0 +1,166 @@
+"""
+Batch API endpoint.
+
+``POST /api/batch/`` runs several API calls in one round-trip. The JWT is
+checked once for the batch; each sub-request is then dispatched
+in-process to the view it names, as the same user, so it still goes
+through that view's permission checks, filters and serializers.
+Batches made only of reads may run their sub-requests in parallel.
+"""
+import io
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import DatabaseError, connections
+from django.urls import Resolver404, resolve
+from rest_framework import serializers
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import db_routing
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'MAX_REQUESTS': 20,
+    'MAX_WORKERS': 4,
+    'ALLOWED_PREFIXES': ['/api/employees/', '/api/auth/'],
+}
+
+METHODS = ['GET', 'HEAD', 'OPTIONS', 'POST', 'PUT', 'PATCH', 'DELETE']
+
+
+def get_batch_setting(name):
+    return getattr(settings, 'BATCH_API', {}).get(name, DEFAULTS[name])
+
+
+class SubRequestSerializer(serializers.Serializer):
+    id = serializers.CharField(required=False, max_length=100)
+    method = serializers.CharField(default='GET')
+    path = serializers.CharField(max_length=2000)
+    params = serializers.DictField(required=False, default=dict)
+    body = serializers.JSONField(required=False)
+
+    def validate_method(self, value):
+        value = value.upper()
+        if value not in METHODS:
+            raise serializers.ValidationError(f'Unsupported method: {value}')
+        return value
+
+    def validate_path(self, value):
+        if '?' in value:
+            raise serializers.ValidationError('Pass query parameters in "params".')
+        if not any(value.startswith(prefix) for prefix in get_batch_setting('ALLOWED_PREFIXES')):
+            raise serializers.ValidationError(f'Path not allowed in a batch: {value}')
+        return value
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    requests = SubRequestSerializer(many=True)
+    parallel = serializers.BooleanField(default=False)
+
+    def validate_requests(self, value):
+        if not value:
+            raise serializers.ValidationError('At least one request is required.')
+        limit = get_batch_setting('MAX_REQUESTS')
+        if len(value) > limit:
+            raise serializers.ValidationError(f'At most {limit} requests per batch.')
+        return value
+
+
+def build_request(parent, sub):
+    """Build the Django request for one sub-request of ``parent``"""
+    body = b'' if sub.get('body') is None else json.dumps(sub['body']).encode()
+    environ = dict(parent.META)
+    environ.update({
+        'REQUEST_METHOD': sub['method'],
+        'PATH_INFO': sub['path'],
+        'QUERY_STRING': urlencode(sub['params'], doseq=True),
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(body)),
+        'HTTP_ACCEPT': 'application/json',
+        'wsgi.input': io.BytesIO(body),
+    })
+    environ.setdefault('wsgi.url_scheme', parent.scheme)
+
+    request = WSGIRequest(environ)
+    request.user = parent.user
+    # DRF's Request authenticates a forced user without decoding the JWT
+    # again; the view's own permission classes still apply
+    request._force_auth_user = parent.user
+    request._force_auth_token = parent.auth
+    return request
+
+
+def run_sub_request(parent, sub):
+    """Dispatch one sub-request and return its {id, status, body} entry"""
+    request = build_request(parent, sub)
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return {'id': sub.get('id'), 'status': 404, 'body': {'detail': 'Not found.'}}
+
+    def call_view():
+        return match.func(request, *match.args, **match.kwargs)
+
+    try:
+        alias = db_routing.replica_for(request, match.func)
+        try:
+            with db_routing.reading_from(alias):
+                response = call_view()
+        except DatabaseError as exc:
+            if alias is None:
+                raise
+            db_routing.mark_unhealthy(alias)
+            logger.warning('Read from replica %s failed, retrying on primary: %s', alias, exc)
+            response = call_view()
+    except Exception:
+        logger.exception('Batch sub-request %s %s failed', sub['method'], sub['path'])
+        return {'id': sub.get('id'), 'status': 500, 'body': {'detail': 'Internal server error.'}}
+
+    # DRF responses are returned as data rather than rendered and re-parsed
+    if hasattr(response, 'data'):
+        body = response.data
+    else:
+        body = response.content.decode(response.charset or 'utf-8')
+    return {'id': sub.get('id'), 'status': response.status_code, 'body': body}
+
+
+def _run_in_worker(parent, sub):
+    try:
+        return run_sub_request(parent, sub)
+    finally:
+        # Worker threads open their own connections; do not leak them
+        connections.close_all()
+
+
+class BatchView(APIView):
+    """
+    Run up to BATCH_API['MAX_REQUESTS'] API calls and return every
+    response in order. ``parallel`` runs them concurrently when none of
+    them writes.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = BatchRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        sub_requests = serializer.validated_data['requests']
+
+        read_only = all(sub['method'] in db_routing.SAFE_METHODS for sub in sub_requests)
+        # A read-only batch must not pin the client to the primary
+        request._request.performs_writes = not read_only
+
+        if serializer.validated_data['parallel'] and read_only and len(sub_requests) > 1:
+            workers = min(get_batch_setting('MAX_WORKERS'), len(sub_requests))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                responses = list(pool.map(lambda sub: _run_in_worker(request, sub), sub_requests))
+        else:
+            responses = [run_sub_request(request, sub) for sub in sub_requests]
+
+        return Response({'responses': responses})
@@ -0,0 +1,205 @@
+"""
+Response compression with Accept-Encoding negotiation.
+
+gzip is always available; brotli and zstd are used when the optional
+``brotli`` and ``zstandard`` packages are installed.
+"""
+import re
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULTS = {
+    'MIN_SIZE': 1024,
+    'GZIP_LEVEL': 6,
+    'BROTLI_QUALITY': 4,
+    'ZSTD_LEVEL': 3,
+    # Content types that are compressed already; encoding them again
+    # costs CPU and saves nothing. Entries ending in '/' match a family.
+    'SKIP_CONTENT_TYPES': [
+        'image/', 'audio/', 'video/', 'font/woff',
+        'application/zip', 'application/gzip', 'application/x-7z-compressed',
+        'application/pdf', 'application/octet-stream',
+    ],
+    # image/svg+xml is text despite the image/ family
+    'COMPRESS_CONTENT_TYPES': ['image/svg+xml'],
+}
+
+# Server preference when the client accepts several encodings equally
+ENCODING_PREFERENCE = ['zstd', 'br', 'gzip']
+
+_accept_encoding_re = re.compile(r'\s*([a-z*]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?', re.IGNORECASE)
+
+
+def get_compression_setting(name):
+    return getattr(settings, 'RESPONSE_COMPRESSION', {}).get(name, DEFAULTS[name])
+
+
+def available_encodings():
+    encodings = ['gzip']
+    if brotli is not None:
+        encodings.insert(0, 'br')
+    if zstandard is not None:
+        encodings.insert(0, 'zstd')
+    return encodings
+
+
+def negotiate_encoding(accept_encoding, encodings=None):
+    """Pick the best encoding the client accepts, or None for identity"""
+    encodings = encodings or available_encodings()
+    weights = {}
+    for part in accept_encoding.split(','):
+        match = _accept_encoding_re.match(part)
+        if not match:
+            continue
+        try:
+            weights[match.group(1).lower()] = float(match.group(2) or 1)
+        except ValueError:
+            continue
+
+    wildcard = weights.get('*', 0)
+    best, best_weight = None, 0
+    for encoding in ENCODING_PREFERENCE:
+        if encoding not in encodings:
+            continue
+        weight = weights.get(encoding, wildcard)
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compressor(encoding):
+    """Return an object with compress()/flush() for the given encoding"""
+    if encoding == 'gzip':
+        return zlib.compressobj(get_compression_setting('GZIP_LEVEL'), zlib.DEFLATED, 31)
+    if encoding == 'br':
+        return _BrotliCompressor(brotli.Compressor(quality=get_compression_setting('BROTLI_QUALITY')))
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=get_compression_setting('ZSTD_LEVEL')).compressobj()
+    raise ValueError(f'Unsupported encoding: {encoding}')
+
+
+def flush_block(encoding, stream):
+    """
+    Emit everything ``stream`` has buffered without ending it, so each
+    streamed chunk reaches the client as soon as it is produced.
+    """
+    if encoding == 'gzip':
+        return stream.flush(zlib.Z_SYNC_FLUSH)
+    if encoding == 'zstd':
+        return stream.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+    return stream.flush_block()
+
+
+def is_compressible(content_type):
+    """False for content types that are already compressed"""
+    content_type = content_type.split(';', 1)[0].strip().lower()
+    if content_type in get_compression_setting('COMPRESS_CONTENT_TYPES'):
+        return True
+    return not any(
+        content_type.startswith(skipped) if skipped.endswith('/') else content_type == skipped
+        for skipped in get_compression_setting('SKIP_CONTENT_TYPES')
+    )
+
+
+def compress(encoding, data):
+    stream = compressor(encoding)
+    return stream.compress(data) + stream.flush()
+
+
+def compress_sequence(encoding, sequence):
+    stream = compressor(encoding)
+    for chunk in sequence:
+        if chunk:
+            yield stream.compress(chunk) + flush_block(encoding, stream)
+    yield stream.flush()
+
+
+async def compress_async_sequence(encoding, sequence):
+    stream = compressor(encoding)
+    async for chunk in sequence:
+        if chunk:
+            yield stream.compress(chunk) + flush_block(encoding, stream)
+    yield stream.flush()
+
+
+class _BrotliCompressor:
+    """Adapt brotli's process()/finish() to the zlib compressobj interface"""
+
+    def __init__(self, compressor):
+        self._compressor = compressor
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush_block(self):
+        return self._compressor.flush()
+
+    def flush(self):
+        return self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    Compress responses larger than RESPONSE_COMPRESSION['MIN_SIZE'] with
+    the best encoding the client accepts. Streaming responses are
+    compressed and flushed chunk by chunk without buffering the whole
+    body. Already-compressed content such as images is passed through.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding'):
+            return response
+        if not is_compressible(response.get('Content-Type', '')):
+            return response
+        if not response.streaming and len(response.content) < get_compression_setting('MIN_SIZE'):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compress_async_sequence(
+                    encoding, response.streaming_content
+                )
+            else:
+                response.streaming_content = compress_sequence(
+                    encoding, response.streaming_content
+                )
+            del response.headers['Content-Length']
+        else:
+            compressed = compress(encoding, response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        # The compressed body is no longer byte-identical to a strong ETag
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+
+        response.headers['Content-Encoding'] = encoding
+        return response
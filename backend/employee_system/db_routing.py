@@ -0,0 +1,174 @@
+"""
+Primary/replica database routing.
+
+Reads are sent to a replica only while ReplicaRoutingMiddleware has
+marked the current request as replica-safe: a safe HTTP method on a view
+decorated with ``replica_reads`` (or a view class with
+``replica_reads = True``), from a client that has not written recently.
+Everything else, including all writes, uses the ``default`` database.
+
+A write pins its client to the primary with a signed, short-lived
+cookie, which every worker can verify without shared state. Clients
+that do not keep cookies are also pinned in the cache, which covers
+other workers only when CACHE_URL names a shared cache.
+"""
+import hashlib
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+PIN_COOKIE = 'db_pin'
+PIN_COOKIE_SALT = 'employee_system.db_routing.pin'
+
+# Replica alias chosen for the current request, or None for the primary
+_replica_alias = ContextVar('replica_alias', default=None)
+
+# Replica alias -> monotonic time until which it is skipped
+_unhealthy_until = {}
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias != 'default']
+
+
+def healthy_replicas():
+    now = time.monotonic()
+    return [alias for alias in replica_aliases() if _unhealthy_until.get(alias, 0) <= now]
+
+
+def mark_unhealthy(alias):
+    _unhealthy_until[alias] = time.monotonic() + getattr(settings, 'REPLICA_RETRY_AFTER', 30)
+
+
+@contextmanager
+def reading_from(alias):
+    """Send reads inside the block to ``alias`` (None for the primary)"""
+    token = _replica_alias.set(alias)
+    try:
+        yield
+    finally:
+        _replica_alias.reset(token)
+
+
+def replica_reads(view):
+    """Mark a function-based view as safe to serve GET/HEAD from a replica"""
+    view.replica_reads = True
+    return view
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _replica_alias.get() or 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive schema changes through replication
+        return db == 'default'
+
+
+def replica_for(request, view_func):
+    """Pick the replica to serve ``view_func`` for this request, or None"""
+    view_class = getattr(view_func, 'cls', None)
+    replicas = healthy_replicas()
+    eligible = (
+        request.method in SAFE_METHODS
+        and (getattr(view_func, 'replica_reads', False)
+             or getattr(view_class, 'replica_reads', False))
+        and replicas
+        and not is_pinned(request)
+    )
+    # One replica per request so a page never mixes replication lag
+    return random.choice(replicas) if eligible else None
+
+
+def pin_seconds():
+    return getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+
+
+def is_pinned(request):
+    """True while the client must read from the primary after a write"""
+    # max_age is checked against the signing time, so an old cookie
+    # replayed after its expiry is ignored
+    if request.get_signed_cookie(PIN_COOKIE, default=None, salt=PIN_COOKIE_SALT, max_age=pin_seconds()):
+        return True
+    return bool(cache.get(_client_pin_key(request)))
+
+
+def pin_to_primary(request, response):
+    response.set_signed_cookie(
+        PIN_COOKIE,
+        '1',
+        salt=PIN_COOKIE_SALT,
+        max_age=pin_seconds(),
+        secure=request.is_secure(),
+        httponly=True,
+        samesite='Lax',
+    )
+    cache.set(_client_pin_key(request), True, pin_seconds())
+
+
+def _client_pin_key(request):
+    credential = (
+        request.META.get('HTTP_AUTHORIZATION')
+        or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        or request.META.get('REMOTE_ADDR', '')
+    )
+    return 'db-pin:' + hashlib.sha256(credential.encode()).hexdigest()
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Route replica-safe reads to a replica, pin clients to the primary for
+    REPLICA_PIN_SECONDS after they write (read-your-writes), and retry a
+    read on the primary when the replica fails.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            _replica_alias.set(None)
+
+        # Views may set performs_writes, e.g. a POST that only reads
+        writes = getattr(request, 'performs_writes', request.method not in SAFE_METHODS)
+        if writes and response.status_code < 400:
+            pin_to_primary(request, response)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        alias = replica_for(request, view_func)
+        _replica_alias.set(alias)
+        request.replica_view = (alias, view_func, view_args, view_kwargs) if alias else None
+        return None
+
+    def process_exception(self, request, exception):
+        replica_view = getattr(request, 'replica_view', None)
+        if replica_view is None or not isinstance(exception, DatabaseError):
+            return None
+
+        alias, view_func, view_args, view_kwargs = replica_view
+        mark_unhealthy(alias)
+        logger.warning('Read from replica %s failed, retrying on primary: %s', alias, exception)
+
+        _replica_alias.set(None)
+        request.replica_view = None
+        return view_func(request, *view_args, **view_kwargs)
@@ -1,14 +1,14 @@
 import os
 from pathlib import Path
 from datetime import timedelta
+from urllib.parse import urlparse
 from decouple import config
-from dotenv import load_dotenv
 import dj_database_url
 
+# decouple reads backend/.env (found by searching up from this file) and
+# lets real environment variables override it
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-load_dotenv(BASE_DIR / ".env")
-
 
 SECRET_KEY = config('SECRET_KEY', default='django-insecure-change-this-in-production')
 
@@ -37,15 +37,23 @@ INSTALLED_APPS = [
     'authentication',
 ]
 
+# API-only workers (e.g. behind a load balancer that sends /admin/ to a
+# separate pool) skip loading the admin site at startup
+API_ONLY = config('API_ONLY', default=False, cast=bool)
+if API_ONLY:
+    INSTALLED_APPS.remove('django.contrib.admin')
+
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'employee_system.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'employee_system.db_routing.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'employee_system.urls'
@@ -69,10 +77,53 @@ TEMPLATES = [
 WSGI_APPLICATION = 'employee_system.wsgi.application'
 
 # Database
+# DATABASE_URL selects the primary; DATABASE_REPLICA_URLS is an optional
+# comma-separated list of read replicas of it
 DATABASES = {
+    'default': dj_database_url.parse(
+        config('DATABASE_URL', default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}"),
+        conn_max_age=config('DATABASE_CONN_MAX_AGE', default=0, cast=int),
+    ),
+}
+
+for index, replica_url in enumerate(
+    url.strip() for url in config('DATABASE_REPLICA_URLS', default='').split(',') if url.strip()
+):
+    DATABASES[f'replica_{index + 1}'] = dj_database_url.parse(
+        replica_url,
+        conn_max_age=DATABASES['default']['CONN_MAX_AGE'],
+    )
+    DATABASES[f'replica_{index + 1}']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['employee_system.db_routing.PrimaryReplicaRouter']
+
+# Seconds a client reads from the primary after writing (read-your-writes)
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=5, cast=int)
+# Seconds a failing replica is skipped before being tried again
+REPLICA_RETRY_AFTER = config('REPLICA_RETRY_AFTER', default=30, cast=int)
+
+# CACHE_URL selects the cache. The default, locmem://, is private to each
+# process: with several workers, cache-based state such as the employee
+# data generation is not seen by the other workers, so production should
+# use redis://host:6379/0 or memcached://host:11211.
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'rediss': 'django.core.cache.backends.redis.RedisCache',
+    'memcached': 'django.core.cache.backends.memcached.PyMemcacheCache',
+    # Shared through the database; run `python manage.py createcachetable`
+    'db': 'django.core.cache.backends.db.DatabaseCache',
+}
+_cache_url = urlparse(config('CACHE_URL', default='locmem://'))
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': CACHE_BACKENDS[_cache_url.scheme],
+        'LOCATION': {
+            'redis': _cache_url.geturl(),
+            'rediss': _cache_url.geturl(),
+            'memcached': _cache_url.netloc,
+            'db': _cache_url.netloc or 'django_cache',
+        }.get(_cache_url.scheme, ''),
     }
 }
 
@@ -143,6 +194,64 @@ SIMPLE_JWT = {
     'USER_ID_CLAIM': 'user_id',
 }
 
+# Response Compression Configuration
+# brotli and zstd are negotiated only when `brotli` / `zstandard` are installed
+RESPONSE_COMPRESSION = {
+    'MIN_SIZE': config('COMPRESSION_MIN_SIZE', default=1024, cast=int),
+    'GZIP_LEVEL': 6,
+    'BROTLI_QUALITY': 4,
+    'ZSTD_LEVEL': 3,
+}
+
+# Audit Log Configuration
+AUDIT_LOG = {
+    'ASYNC': config('AUDIT_LOG_ASYNC', default=True, cast=bool),
+    'BATCH_SIZE': config('AUDIT_LOG_BATCH_SIZE', default=100, cast=int),
+    'FLUSH_INTERVAL': config('AUDIT_LOG_FLUSH_INTERVAL', default=2.0, cast=float),
+    'MAX_QUEUE_SIZE': 10000,
+    # Batches that fail to reach the database are appended here and replayed
+    'SPOOL_PATH': config('AUDIT_LOG_SPOOL_PATH', default=str(BASE_DIR / 'audit_spool.jsonl')),
+}
+
+# Autocomplete Index Configuration
+AUTOCOMPLETE_INDEX = {
+    # Build the index when a worker starts rather than on the first lookup
+    'BUILD_AT_STARTUP': config('AUTOCOMPLETE_INDEX_AT_STARTUP', default=True, cast=bool),
+    # Rebuilt in the background this often to pick up other workers' writes
+    'MAX_AGE': config('AUTOCOMPLETE_INDEX_MAX_AGE', default=300, cast=int),
+}
+
+# Batch API Configuration
+BATCH_API = {
+    'MAX_REQUESTS': 20,
+    # Threads used for read-only batches sent with "parallel": true
+    'MAX_WORKERS': config('BATCH_API_MAX_WORKERS', default=4, cast=int),
+    'ALLOWED_PREFIXES': ['/api/employees/', '/api/auth/'],
+}
+
+# Employee Archive Configuration
+EMPLOYEE_ARCHIVE = {
+    # Terminated employees unchanged for this many days are archived
+    'RETENTION_DAYS': config('EMPLOYEE_ARCHIVE_RETENTION_DAYS', default=365, cast=int),
+    'BATCH_SIZE': config('EMPLOYEE_ARCHIVE_BATCH_SIZE', default=500, cast=int),
+}
+
+# Worker Warm-up
+WARM_UP = {
+    # Build serializers, filtersets and DB connections before serving
+    'ENABLED': config('WARM_UP', default=not DEBUG, cast=bool),
+    'ACTIONS': ['list', 'retrieve', 'create'],
+}
+
+# Duplicate Employee Detection
+DUPLICATE_DETECTION = {
+    # Pairs scoring at least this much (0-1) are reported and warned about
+    'THRESHOLD': config('DUPLICATE_THRESHOLD', default=0.75, cast=float),
+    # Processes used by the find_duplicates report
+    'WORKERS': config('DUPLICATE_WORKERS', default=os.cpu_count() or 1, cast=int),
+    'MAX_BLOCK_SIZE': 200,
+}
+
 # CORS Configuration
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -0,0 +1,77 @@
+"""
+Measure one cold worker start; run by the ``startup_profile`` command.
+
+    python -m employee_system.startup_probe [--warm] PATH [PATH ...]
+
+Boots the WSGI application the way a server worker does, optionally
+runs the warm-up, then sends each PATH through the application twice.
+Prints a JSON object with the timings in milliseconds. A bearer token
+for the requests is read from STARTUP_PROBE_TOKEN.
+
+Only the standard library is imported before the application, so the
+boot time includes all of Django's own startup.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from wsgiref.util import setup_testing_defaults
+
+
+def send(application, host, path, token):
+    """Send one GET through ``application``; return (milliseconds, status)"""
+    path, _, query = path.partition('?')
+    environ = {'PATH_INFO': path, 'QUERY_STRING': query, 'HTTP_HOST': host}
+    if token:
+        environ['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+    setup_testing_defaults(environ)
+    statuses = []
+
+    started = time.perf_counter()
+    body = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+    try:
+        for _ in body:
+            pass
+    finally:
+        if hasattr(body, 'close'):
+            body.close()
+    return (time.perf_counter() - started) * 1000, int(statuses[0].split()[0])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--warm', action='store_true', help='Run the warm-up before the requests')
+    parser.add_argument('paths', nargs='+')
+    args = parser.parse_args(argv)
+
+    # wsgi.py must not warm up on its own; the warm-up is timed separately
+    os.environ['WARM_UP'] = 'false'
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'employee_system.settings')
+
+    started = time.perf_counter()
+    from employee_system.wsgi import application
+    result = {'boot': (time.perf_counter() - started) * 1000, 'warm_up': 0}
+
+    from employee_system import warmup
+    if args.warm:
+        started = time.perf_counter()
+        warmup.warm_up()
+        result['warm_up'] = (time.perf_counter() - started) * 1000
+
+    host = warmup.allowed_host()
+    token = os.environ.get('STARTUP_PROBE_TOKEN')
+    result['requests'] = {}
+    for path in args.paths:
+        first, status = send(application, host, path, token)
+        second, _ = send(application, host, path, token)
+        result['requests'][path] = {'first': first, 'second': second, 'status': status}
+
+    result['loaded'] = {
+        name: name in sys.modules for name in ['numpy', 'PIL', 'employees.admin']
+    }
+    print(json.dumps(result))
+
+
+if __name__ == '__main__':
+    main()
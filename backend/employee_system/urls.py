@@ -1,14 +1,21 @@
-from django.contrib import admin
+from django.apps import apps
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from .batch import BatchView
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('api/auth/', include('authentication.urls')),
     path('api/employees/', include('employees.urls')),
+    path('api/batch/', BatchView.as_view(), name='batch'),
 ]
 
+# Left out on API_ONLY workers
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
+
 # Serve media files in development
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
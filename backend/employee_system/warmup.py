@@ -0,0 +1,107 @@
+"""
+Worker warm-up.
+
+A fresh worker does a lot of work lazily on its first request: importing
+the URLconf and every view behind it, building serializer fields and
+filtersets, compiling the first queries and opening the database
+connection. ``warm_up()`` does that work up front; wsgi.py calls it
+before the worker accepts traffic when WARM_UP['ENABLED'] is set.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.test import RequestFactory
+from django.urls import get_resolver
+
+from . import db_routing
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ENABLED': False,
+    # Viewset actions whose serializers and filtersets are pre-built
+    'ACTIONS': ['list', 'retrieve', 'create'],
+}
+
+
+def get_warmup_setting(name):
+    return getattr(settings, 'WARM_UP', {}).get(name, DEFAULTS[name])
+
+
+def allowed_host():
+    """A host name ALLOWED_HOSTS accepts, for requests built in-process"""
+    hosts = [host for host in settings.ALLOWED_HOSTS if host and host != '*']
+    return hosts[0].lstrip('.') if hosts else 'localhost'
+
+
+def warm_up():
+    """Run every warm-up step and return {step: seconds}; failures are logged, not raised"""
+    steps = [
+        ('urls', warm_urls),
+        ('database', warm_databases),
+        ('authentication', warm_authentication),
+        ('employee_views', warm_employee_views),
+    ]
+
+    timings = {}
+    for name, step in steps:
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception:
+            logger.exception('Warm-up step %s failed', name)
+        timings[name] = time.perf_counter() - started
+    logger.info('Warm-up finished: %s', ', '.join(
+        f'{name} {seconds * 1000:.0f} ms' for name, seconds in timings.items()
+    ))
+    return timings
+
+
+def warm_urls():
+    """Import the URLconf, and with it every view module, and fill the reverse map"""
+    resolver = get_resolver()
+    resolver.resolve('/api/employees/')
+    resolver.reverse_dict
+
+
+def warm_databases():
+    """
+    Connect to the primary and to every replica, so the driver is loaded
+    and unreachable replicas are known. wsgi.py closes the connections
+    once startup is done.
+    """
+    for alias in connections:
+        try:
+            connections[alias].ensure_connection()
+        except Exception:
+            if alias == 'default':
+                raise
+            db_routing.mark_unhealthy(alias)
+            logger.warning('Replica %s is unreachable during warm-up', alias)
+
+
+def warm_authentication():
+    """Load the JWT backend, which simplejwt imports on the first authenticated request"""
+    from rest_framework_simplejwt.state import token_backend  # noqa: F401
+
+
+def warm_employee_views():
+    """
+    Build the EmployeeViewSet serializers and filterset, compile its list
+    query and render a row, so the first real request finds them ready.
+    """
+    from employees.views import EmployeeViewSet
+
+    http_request = RequestFactory().get('/api/employees/', HTTP_HOST=allowed_host())
+    for action in get_warmup_setting('ACTIONS'):
+        view = EmployeeViewSet(action_map={'get': action}, format_kwarg=None, args=(), kwargs={})
+        view.request = view.initialize_request(http_request)
+        serializer_class = view.get_serializer_class()
+        context = view.get_serializer_context()
+        serializer_class(context=context).fields
+        if action == 'list':
+            rows = list(view.filter_queryset(view.get_queryset())[:1])
+            serializer_class(rows, many=True, context=context).data
+
@@ -13,4 +13,20 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'employee_system.settings')
 
-application = get_wsgi_application()
\ No newline at end of file
+application = get_wsgi_application()
+
+# Do the first request's lazy work before this worker accepts traffic
+from django.db import connections  # noqa: E402
+from employees.search_index import employee_index, get_index_setting  # noqa: E402
+from .warmup import get_warmup_setting, warm_up  # noqa: E402
+
+if get_index_setting('BUILD_AT_STARTUP', True):
+    employee_index.start()
+
+if get_warmup_setting('ENABLED'):
+    warm_up()
+
+# With gunicorn --preload this runs in the master, and workers forked
+# from it must not inherit its open database connections. Requests
+# reconnect on first use.
+connections.close_all()
@@ -1,5 +1,54 @@
-from django.contrib import admin
-from .models import Employee
+import re
+
+from django.contrib import admin, messages
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Upper
+from django.utils import timezone
+from .models import ArchivedEmployee, Employee, EmployeeAuditLog
+from .cache import bump_data_generation
+from .pagination import EstimatedCountPaginator
+from .search_index import employee_index
+from . import archive, audit
+
+EMPLOYEE_ID_PATTERN = re.compile(r'^EMP\d{4,}$')
+
+
+def make_bulk_update_action(field_name, value, description, audit_action='UPDATE'):
+    """
+    Build an admin action that sets ``field_name`` to ``value`` on the
+    selected employees with a single UPDATE statement.
+    """
+    @admin.action(description=description, permissions=['change'])
+    def bulk_update(modeladmin, request, queryset):
+        to_change = queryset.exclude(**{field_name: value})
+        with transaction.atomic():
+            # One SELECT for the audit trail's previous values, one UPDATE
+            previous = list(to_change.values_list('pk', field_name))
+            updated = to_change.update(**{
+                field_name: value,
+                'updated_by': request.user,
+                'updated_at': timezone.now(),
+            })
+            audit.record_bulk_change(previous, field_name, value, request.user, audit_action)
+            
+            def _refresh():
+                if field_name == 'department':
+                    employee_index.update_department([pk for pk, _ in previous], value)
+                bump_data_generation()
+            
+            transaction.on_commit(_refresh)
+        
+        modeladmin.message_user(
+            request,
+            f'{updated} employee(s) updated.',
+            messages.SUCCESS
+        )
+    
+    bulk_update.__name__ = f'set_{field_name}_{value.lower()}'
+    return bulk_update
+
 
 @admin.register(Employee)
 class EmployeeAdmin(admin.ModelAdmin):
@@ -14,8 +63,26 @@ class EmployeeAdmin(admin.ModelAdmin):
         'hire_date',
     ]
     list_filter = ['department', 'employment_status', 'gender', 'hire_date']
-    search_fields = ['employee_id', 'first_name', 'last_name', 'email', 'phone']
+    search_fields = ['employee_id', 'first_name', 'last_name', 'email']
+    search_help_text = 'Employee ID, email, or the start of a first/last name'
     readonly_fields = ['created_at', 'updated_at', 'created_by', 'updated_by']
+    raw_id_fields = ['manager']
+    
+    # Large-table changelist: estimated counts, no second unfiltered
+    # COUNT(*), and deferred-join pagination for deep pages
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 100
+    
+    actions = [
+        make_bulk_update_action(
+            'employment_status', code, f'Set status to {label}', audit_action='STATUS_CHANGE'
+        )
+        for code, label in Employee.EMPLOYMENT_STATUS_CHOICES
+    ] + [
+        make_bulk_update_action('department', code, f'Move to {label}')
+        for code, label in Employee.DEPARTMENT_CHOICES
+    ]
     
     fieldsets = (
         ('Personal Information', {
@@ -38,6 +105,7 @@ class EmployeeAdmin(admin.ModelAdmin):
                 'hire_date',
                 'salary',
                 'employment_status',
+                'manager',
             )
         }),
         ('Emergency Contact', {
@@ -58,8 +126,101 @@ class EmployeeAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Route each search to an indexed predicate instead of OR-ing
+        icontains over every search field.
+        """
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        
+        if EMPLOYEE_ID_PATTERN.match(term.upper()):
+            return queryset.filter(employee_id=term.upper()), False
+        if '@' in term:
+            return queryset.filter(Q(email=term) | Q(email=term.lower())), False
+        
+        # Prefixes of UPPER(name), which PrefixSearchIndex covers;
+        # istartswith on the bare columns cannot use a B-tree index
+        queryset = queryset.alias(
+            first_name_upper=Upper('first_name'),
+            last_name_upper=Upper('last_name'),
+        )
+        words = term.upper().split()
+        if len(words) >= 2:
+            return queryset.filter(
+                first_name_upper__startswith=words[0],
+                last_name_upper__startswith=' '.join(words[1:])
+            ), False
+        return queryset.filter(
+            Q(last_name_upper__startswith=words[0]) | Q(first_name_upper__startswith=words[0])
+        ), False
+    
     def save_model(self, request, obj, form, change):
-        if not change:
+        before = {}
+        if change:
+            # form.initial still holds the values loaded from the database
+            before = audit.snapshot_values(form.initial)
+        else:
             obj.created_by = request.user
         obj.updated_by = request.user
         super().save_model(request, obj, form, change)
+        audit.record_change(obj, before, request.user, action='UPDATE' if change else 'CREATE')
+
+
+@admin.register(EmployeeAuditLog)
+class EmployeeAuditLogAdmin(admin.ModelAdmin):
+    list_display = ['employee_id', 'action', 'changed_by', 'changed_at']
+    list_filter = ['action']
+    raw_id_fields = ['employee', 'changed_by']
+    readonly_fields = ['employee', 'action', 'changes', 'changed_by', 'changed_at']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ArchivedEmployee)
+class ArchivedEmployeeAdmin(admin.ModelAdmin):
+    list_display = [
+        'employee_id',
+        'first_name',
+        'last_name',
+        'email',
+        'department',
+        'position',
+        'archived_at',
+    ]
+    list_filter = ['department', 'archived_at']
+    search_fields = ['=employee_id', '=email', '^last_name', '^first_name']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 100
+    actions = ['restore_selected']
+    
+    @admin.action(description='Restore selected employees', permissions=['delete'])
+    def restore_selected(self, request, queryset):
+        restored, failed = 0, []
+        for archived in queryset:
+            try:
+                archive.restore_employee(archived, request.user)
+            except ValidationError:
+                failed.append(archived.employee_id)
+            else:
+                restored += 1
+        
+        self.message_user(request, f'{restored} employee(s) restored.', messages.SUCCESS)
+        if failed:
+            self.message_user(
+                request,
+                f"Not restored, ID or email now used by a live employee: {', '.join(failed)}",
+                messages.WARNING
+            )
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,162 @@
+"""
+Hot/cold split for terminated employees.
+
+Terminated employees whose record has not changed for
+``EMPLOYEE_ARCHIVE['RETENTION_DAYS']`` days are moved from the live
+employee table into ArchivedEmployee in batches. Every batch is its own
+transaction and the candidate set is recomputed for each one, so an
+interrupted job resumes where it stopped when it is started again.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connections, router, transaction
+from django.utils import timezone
+
+from .cache import bump_data_generation
+from .models import ArchivedEmployee, Employee
+from .search_index import employee_index
+from . import audit, hierarchy
+
+DEFAULTS = {
+    'RETENTION_DAYS': 365,
+    'BATCH_SIZE': 500,
+}
+
+
+def get_archive_setting(name):
+    return getattr(settings, 'EMPLOYEE_ARCHIVE', {}).get(name, DEFAULTS[name])
+
+
+def shared_columns():
+    """Column attnames present in both the live and the archive table"""
+    archived = {field.attname for field in ArchivedEmployee._meta.concrete_fields}
+    return [
+        field.attname for field in Employee._meta.concrete_fields
+        if field.attname in archived
+    ]
+
+
+def archive_candidates(retention_days=None, now=None):
+    """
+    Terminated employees untouched for ``retention_days``. updated_at is
+    the last write to the record, which for a terminated employee is
+    normally the status change itself.
+    """
+    if retention_days is None:
+        retention_days = get_archive_setting('RETENTION_DAYS')
+    cutoff = (now or timezone.now()) - timedelta(days=retention_days)
+    return Employee.objects.filter(employment_status='TERMINATED', updated_at__lt=cutoff)
+
+
+def _after_move(pks, user, action):
+    audit.record_moves(pks, user, action)
+
+    def _refresh():
+        employee_index.remove_many(pks)
+        bump_data_generation()
+
+    transaction.on_commit(_refresh)
+
+
+def _delete_rows(using, pks):
+    """
+    Delete live employee rows with one plain DELETE. Model.delete() would
+    run the per-row delete signals, which update the search index and
+    caches once per employee instead of once per batch.
+    """
+    connection = connections[using]
+    table = connection.ops.quote_name(Employee._meta.db_table)
+    column = connection.ops.quote_name(Employee._meta.pk.column)
+    placeholders = ', '.join(['%s'] * len(pks))
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table} WHERE {column} IN ({placeholders})', pks)
+
+
+def archive_batch(queryset, batch_size=None, user=None):
+    """
+    Move up to ``batch_size`` employees from ``queryset`` into the archive
+    in one transaction and return their primary keys.
+    """
+    batch_size = batch_size or get_archive_setting('BATCH_SIZE')
+    columns = shared_columns()
+    using = router.db_for_write(Employee)
+
+    with transaction.atomic(using=using):
+        rows = queryset.using(using).order_by('pk')
+        if connections[using].features.has_select_for_update:
+            # Keep concurrent edits out until the rows have moved
+            rows = rows.select_for_update()
+        rows = list(rows.values(*columns)[:batch_size])
+        if not rows:
+            return []
+
+        archived_at = timezone.now()
+        ArchivedEmployee.objects.using(using).bulk_create([
+            ArchivedEmployee(
+                **row,
+                archived_at=archived_at,
+                archived_by_id=user.pk if user else None
+            )
+            for row in rows
+        ])
+        pks = [row['id'] for row in rows]
+        hierarchy.remove_nodes(pks, user)
+        _delete_rows(using, pks)
+        _after_move(pks, user, 'ARCHIVE')
+    return pks
+
+
+def archive_in_batches(queryset=None, batch_size=None, max_batches=None, pause=0, user=None):
+    """
+    Archive ``queryset`` (default: archive_candidates()) batch by batch,
+    yielding the primary keys moved by each batch. ``pause`` seconds
+    between batches leave room for other writers on a busy database.
+    """
+    if queryset is None:
+        queryset = archive_candidates()
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        pks = archive_batch(queryset, batch_size=batch_size, user=user)
+        if not pks:
+            return
+        batches += 1
+        yield pks
+        if pause:
+            time.sleep(pause)
+
+
+def restore_employee(archived, user=None):
+    """
+    Move an archived employee back into the live table with its original
+    id and return the new Employee. Raises ValidationError when a live
+    employee has since taken the same employee ID or email.
+    """
+    conflicts = {}
+    if Employee.objects.filter(employee_id=archived.employee_id).exists():
+        conflicts['employee_id'] = f'Employee ID {archived.employee_id} is in use by a live employee.'
+    if Employee.objects.filter(email=archived.email).exists():
+        conflicts['email'] = f'Email {archived.email} is in use by a live employee.'
+    if conflicts:
+        raise ValidationError(conflicts)
+
+    employee = Employee(**{name: getattr(archived, name) for name in shared_columns()})
+    if employee.manager_id and not Employee.objects.filter(pk=employee.manager_id).exists():
+        # The old manager has left too; restore without a reporting line
+        employee.manager_id = None
+    # Restoring is a write, and a fresh updated_at keeps the next archive
+    # run from moving the employee straight back
+    employee.updated_at = timezone.now()
+    employee.updated_by_id = user.pk if user else None
+
+    try:
+        with transaction.atomic():
+            # raw keeps the original id and created_at (no auto_now_add)
+            employee.save_base(raw=True, force_insert=True)
+            ArchivedEmployee.objects.filter(pk=archived.pk).delete()
+            audit.record_moves([employee.pk], user, 'RESTORE')
+    except IntegrityError:
+        raise ValidationError('The employee conflicts with a live employee record.')
+    return employee
@@ -0,0 +1,324 @@
+"""
+Employee audit trail.
+
+Field diffs are computed on the request thread, handed to an in-process
+buffer once the surrounding transaction commits, and written in batches
+by a background thread. Batches that cannot be written are appended to a
+spool file and replayed on the next flush; spool lines that cannot be
+replayed are moved to a quarantine file next to it.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.db import DataError, IntegrityError, close_old_connections, models, transaction
+from django.utils import timezone
+
+from .models import Employee, EmployeeAuditLog
+
+logger = logging.getLogger(__name__)
+
+AUDIT_EXCLUDED_FIELDS = {'id', 'created_at', 'updated_at', 'created_by', 'updated_by'}
+
+DEFAULTS = {
+    'ASYNC': True,
+    'BATCH_SIZE': 100,
+    'FLUSH_INTERVAL': 2.0,
+    'MAX_QUEUE_SIZE': 10000,
+    'SPOOL_PATH': None,
+}
+
+
+def get_audit_setting(name):
+    return getattr(settings, 'AUDIT_LOG', {}).get(name, DEFAULTS[name])
+
+
+def tracked_fields():
+    # Non-editable columns (the duplicate blocking keys) are derived from
+    # audited fields and are missing from admin form.initial
+    return [
+        field for field in Employee._meta.concrete_fields
+        if field.editable and field.name not in AUDIT_EXCLUDED_FIELDS
+    ]
+
+
+def _to_string(field, value):
+    # Normalise so the same stored value always compares equal, whatever
+    # type the serializer or form left on the instance (float vs Decimal)
+    if isinstance(field, models.FileField):
+        value = getattr(value, 'name', value)
+    if value is None or value == '':
+        return None
+    if isinstance(field, models.DecimalField):
+        try:
+            exponent = Decimal(1).scaleb(-field.decimal_places)
+            return str(Decimal(str(value)).quantize(exponent))
+        except InvalidOperation:
+            return str(value)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def snapshot_values(values):
+    """Normalise a {field: value} mapping into JSON-safe strings"""
+    return {
+        field.name: _to_string(field, values[field.name])
+        for field in tracked_fields()
+        if field.name in values
+    }
+
+
+def snapshot(instance):
+    """Capture the audited fields of an employee as JSON-safe strings"""
+    return snapshot_values({
+        field.name: field.value_from_object(instance)
+        for field in tracked_fields()
+    })
+
+
+def compute_diff(before, after):
+    """Return {field: [old, new]} for every field whose value changed"""
+    return {
+        name: [before.get(name), value]
+        for name, value in after.items()
+        if before.get(name) != value
+    }
+
+
+class AuditBuffer:
+    """
+    Thread-safe buffer of pending audit entries flushed in batches.
+
+    The worker thread is started lazily on first use so management
+    commands and migrations never spawn it.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue(maxsize=get_audit_setting('MAX_QUEUE_SIZE'))
+        self._wakeup = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._spool_lock = threading.Lock()
+
+    def enqueue(self, entry):
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            # Never block a request on audit backpressure
+            self._spool([entry])
+            return
+        if self._queue.qsize() >= get_audit_setting('BATCH_SIZE'):
+            self._wakeup.set()
+
+    def flush(self):
+        """Write every pending entry, replaying the spool file first"""
+        with self._flush_lock:
+            try:
+                self._replay_spool()
+            except Exception:
+                # The queue must keep draining even when the spool cannot
+                logger.exception('Audit spool replay failed')
+            while True:
+                batch = self._drain(get_audit_setting('BATCH_SIZE'))
+                if not batch:
+                    break
+                self._write(batch)
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name='employee-audit-flusher',
+                    daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(get_audit_setting('FLUSH_INTERVAL'))
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Audit flush failed')
+            finally:
+                close_old_connections()
+
+    def _drain(self, limit):
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        try:
+            EmployeeAuditLog.objects.bulk_create(
+                [EmployeeAuditLog(**entry) for entry in batch]
+            )
+        except Exception:
+            logger.exception('Audit batch of %d entries spooled to disk', len(batch))
+            self._spool(batch)
+
+    def _spool(self, batch):
+        path = get_audit_setting('SPOOL_PATH')
+        if not path:
+            logger.error('Dropping %d audit entries: AUDIT_LOG SPOOL_PATH is not set', len(batch))
+            return
+        with self._spool_lock, open(path, 'a', encoding='utf-8') as spool:
+            for entry in batch:
+                spool.write(json.dumps(entry, default=str) + '\n')
+
+    def _replay_spool(self):
+        """
+        Write the spooled entries to the database and remove exactly the
+        lines that were written. Lines that do not parse, or that the
+        database rejects, go to the quarantine file instead of blocking
+        every later replay.
+        """
+        path = get_audit_setting('SPOOL_PATH')
+        if not path:
+            return
+        with self._spool_lock:
+            try:
+                with open(path, 'r', encoding='utf-8') as spool:
+                    lines = [line for line in spool if line.strip()]
+            except FileNotFoundError:
+                return
+            if not lines:
+                return
+
+            pending, rejected = [], []
+            for line in lines:
+                try:
+                    pending.append((line, EmployeeAuditLog(**json.loads(line))))
+                except (ValueError, TypeError):
+                    # A torn write or a hand-edited line
+                    rejected.append(line)
+
+            batch_size = get_audit_setting('BATCH_SIZE')
+            try:
+                while pending:
+                    batch = pending[:batch_size]
+                    try:
+                        with transaction.atomic():
+                            EmployeeAuditLog.objects.bulk_create([entry for _, entry in batch])
+                    except (IntegrityError, DataError):
+                        # Find the entries the database refuses, keep the rest
+                        for line, entry in batch:
+                            try:
+                                with transaction.atomic():
+                                    entry.save(force_insert=True)
+                            except (IntegrityError, DataError):
+                                rejected.append(line)
+                    del pending[:len(batch)]
+            finally:
+                # Whatever was not written (e.g. the database went away
+                # mid-replay) stays in the spool for the next flush
+                self._rewrite_spool(path, [line for line, _ in pending])
+                if rejected:
+                    self._quarantine(path, rejected)
+
+    @staticmethod
+    def _rewrite_spool(path, lines):
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as spool:
+            spool.writelines(line if line.endswith('\n') else line + '\n' for line in lines)
+        os.replace(temporary, path)
+
+    @staticmethod
+    def _quarantine(path, lines):
+        quarantine = f'{path}.rejected'
+        logger.error('Moved %d audit spool lines that could not be replayed to %s', len(lines), quarantine)
+        with open(quarantine, 'a', encoding='utf-8') as rejected:
+            rejected.writelines(line if line.endswith('\n') else line + '\n' for line in lines)
+
+
+audit_buffer = AuditBuffer()
+
+
+def record_change(employee, before, user, action='UPDATE'):
+    """
+    Queue an audit entry for the fields of ``employee`` that differ from
+    the ``before`` snapshot. Nothing is queued if no audited field changed.
+    """
+    changes = compute_diff(before or {}, snapshot(employee))
+    if changes:
+        _queue_entry(employee.pk, action, changes, user)
+
+
+def record_bulk_change(old_values, field_name, new_value, user, action='UPDATE'):
+    """
+    Queue one entry per employee for a single-field bulk UPDATE.
+    ``old_values`` is an iterable of (pk, previous value) pairs.
+    """
+    field = Employee._meta.get_field(field_name)
+    new = _to_string(field, new_value)
+    for employee_pk, old_value in old_values:
+        old = _to_string(field, old_value)
+        if old != new:
+            _queue_entry(employee_pk, action, {field_name: [old, new]}, user)
+
+
+def record_deletion(employee_pk, before, user):
+    """Queue a DELETE entry carrying the last known values of the employee"""
+    changes = {name: [value, None] for name, value in before.items()}
+    _queue_entry(employee_pk, 'DELETE', changes, user)
+
+
+def record_moves(employee_pks, user, action):
+    """
+    Queue ARCHIVE / RESTORE entries. Moving between the live and archive
+    tables changes no field, so the entries carry no diff.
+    """
+    for employee_pk in employee_pks:
+        _queue_entry(employee_pk, action, {}, user)
+
+
+def _queue_entry(employee_pk, action, changes, user):
+    entry = {
+        'employee_id': employee_pk,
+        'action': action,
+        'changes': changes,
+        'changed_by_id': user.pk if user and user.is_authenticated else None,
+        'changed_at': timezone.now(),
+    }
+
+    def _enqueue():
+        if get_audit_setting('ASYNC'):
+            audit_buffer.enqueue(entry)
+        else:
+            EmployeeAuditLog.objects.create(**entry)
+
+    transaction.on_commit(_enqueue)
+
+
+def employee_history(employee_pk, before=None, limit=50):
+    """
+    Return one keyset page of audit entries for an employee, newest first.
+
+    ``before`` is the id of the last entry of the previous page.
+    """
+    queryset = EmployeeAuditLog.objects.filter(
+        employee_id=employee_pk
+    ).select_related('changed_by').order_by('-id')
+    if before is not None:
+        queryset = queryset.filter(id__lt=before)
+
+    entries = list(queryset[:limit + 1])
+    next_cursor = entries[limit - 1].id if len(entries) > limit else None
+    return entries[:limit], next_cursor
@@ -0,0 +1,37 @@
+"""
+Data-generation counter for employee-derived caches.
+
+Every write to the employee table bumps the generation, so cached
+results keyed by it become unreachable instead of needing explicit
+invalidation. An evicted generation is re-seeded from the clock rather
+than restarted at 1, so entries cached under an earlier generation never
+become reachable again. Set CACHE_URL to a shared cache when running
+several workers so they all see the same generation.
+"""
+import time
+
+from django.core.cache import cache
+
+GENERATION_KEY = 'employees:data-generation'
+
+
+def _seed_generation():
+    # Nanoseconds since an earlier seed outnumber the bumps made since it
+    seed = time.time_ns()
+    cache.add(GENERATION_KEY, seed, timeout=None)
+    return seed
+
+
+def data_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        seed = _seed_generation()
+        generation = cache.get(GENERATION_KEY, seed)
+    return generation
+
+
+def bump_data_generation():
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        _seed_generation()
@@ -0,0 +1,148 @@
+"""
+Duplicate-employee detection.
+
+Employees are grouped into blocks that share a blocking key (see
+``matching.py``) and only pairs inside a block are scored, so the work
+grows with the block sizes rather than with the square of the table.
+``find_duplicates()`` scans the whole table for the report command, with
+blocks scored in a process pool; ``possible_duplicates()`` checks one
+new employee with an indexed lookup on its keys.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby, repeat
+
+from django.conf import settings
+from django.db.models import Count, Q
+
+from .matching import BLOCKING_FIELDS, MATCH_FIELDS, blocking_keys, score_blocks, score_pair
+from .models import Employee
+
+DEFAULTS = {
+    # Pairs scoring at least this much (0-1) are reported
+    'THRESHOLD': 0.75,
+    'WORKERS': os.cpu_count() or 1,
+    'BLOCKS_PER_TASK': 500,
+    # Blocks larger than this (e.g. a shared switchboard number) are skipped
+    'MAX_BLOCK_SIZE': 200,
+}
+
+
+def get_duplicate_setting(name):
+    return getattr(settings, 'DUPLICATE_DETECTION', {}).get(name, DEFAULTS[name])
+
+
+def _block_sizes(queryset, field):
+    return queryset.exclude(**{field: ''}).order_by().values(field).annotate(
+        size=Count('id')
+    ).filter(size__gt=1)
+
+
+def candidate_blocks(queryset, max_block_size=None):
+    """Yield the lists of employee rows that share a blocking key"""
+    max_block_size = max_block_size or get_duplicate_setting('MAX_BLOCK_SIZE')
+    for field in BLOCKING_FIELDS:
+        keys = _block_sizes(queryset, field).filter(size__lte=max_block_size).values(field)
+        # Sorted on the key's index, so each block is one run of rows
+        rows = queryset.filter(**{f'{field}__in': keys}).order_by(field, 'id').values(*MATCH_FIELDS)
+        for _, block in groupby(rows.iterator(chunk_size=5000), key=lambda row: row[field]):
+            yield list(block)
+
+
+def oversized_blocks(queryset, max_block_size=None):
+    """Number of blocks candidate_blocks() skips for being too large"""
+    max_block_size = max_block_size or get_duplicate_setting('MAX_BLOCK_SIZE')
+    return sum(
+        _block_sizes(queryset, field).filter(size__gt=max_block_size).count()
+        for field in BLOCKING_FIELDS
+    )
+
+
+def find_duplicates(queryset=None, threshold=None, workers=None):
+    """
+    Score every candidate pair in ``queryset`` (default: all employees).
+    Returns the matches as (id, id, score, reasons) tuples, best first,
+    and a dict of statistics about the run.
+    """
+    if queryset is None:
+        queryset = Employee.objects.all()
+    threshold = get_duplicate_setting('THRESHOLD') if threshold is None else threshold
+    workers = workers or get_duplicate_setting('WORKERS')
+    started = time.perf_counter()
+
+    blocks = list(candidate_blocks(queryset))
+    size = get_duplicate_setting('BLOCKS_PER_TASK')
+    tasks = [blocks[start:start + size] for start in range(0, len(blocks), size)]
+    if workers > 1 and len(tasks) > 1:
+        # The scorer is pure Python, so threads would share one core
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            results = list(pool.map(score_blocks, tasks, repeat(threshold)))
+    else:
+        results = [score_blocks(task, threshold) for task in tasks]
+
+    # The same pair can be found in blocks scored by different tasks
+    matches = {}
+    for result in results:
+        for left, right, score, reasons in result:
+            matches[(left, right)] = (left, right, score, reasons)
+    matches = sorted(matches.values(), key=lambda match: (-match[2], match[0], match[1]))
+
+    employees = queryset.count()
+    return matches, {
+        'employees': employees,
+        'naive_pairs': employees * (employees - 1) // 2,
+        'blocks': len(blocks),
+        'skipped_blocks': oversized_blocks(queryset),
+        'candidate_pairs': sum(len(block) * (len(block) - 1) // 2 for block in blocks),
+        'matches': len(matches),
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def possible_duplicates(data, exclude_pk=None, threshold=None, limit=5):
+    """
+    Live employees that look like the same person as ``data`` (a dict of
+    employee fields), best match first, each with its score and the
+    signals that matched.
+    """
+    threshold = get_duplicate_setting('THRESHOLD') if threshold is None else threshold
+    keys = blocking_keys(
+        data.get('first_name'),
+        data.get('last_name'),
+        data.get('email'),
+        data.get('phone'),
+        data.get('date_of_birth')
+    )
+    conditions = Q()
+    for name, value in keys.items():
+        if value:
+            conditions |= Q(**{name: value})
+    if not conditions:
+        return []
+
+    candidates = Employee.objects.filter(conditions)
+    if exclude_pk:
+        candidates = candidates.exclude(pk=exclude_pk)
+    row = {
+        'id': exclude_pk,
+        'first_name': data.get('first_name') or '',
+        'last_name': data.get('last_name') or '',
+        'date_of_birth': data.get('date_of_birth'),
+        **keys,
+    }
+
+    matches = []
+    max_candidates = get_duplicate_setting('MAX_BLOCK_SIZE')
+    for candidate in candidates.values(*MATCH_FIELDS, 'employee_id')[:max_candidates]:
+        score, reasons = score_pair(row, candidate)
+        if score >= threshold:
+            matches.append({
+                'id': candidate['id'],
+                'employee_id': candidate['employee_id'],
+                'full_name': f"{candidate['first_name']} {candidate['last_name']}",
+                'score': score,
+                'reasons': reasons,
+            })
+    matches.sort(key=lambda match: -match['score'])
+    return matches[:limit]
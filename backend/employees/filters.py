@@ -0,0 +1,99 @@
+import django_filters
+from django import forms
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework.filters import OrderingFilter
+
+from .models import ArchivedEmployee, Employee
+
+# Bounds the date arithmetic behind the age and tenure filters
+MAX_YEARS = 150
+
+
+class YearsFilter(django_filters.NumberFilter):
+    """Whole number of years; fractions and exponents are rejected"""
+    field_class = forms.IntegerField
+    
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('min_value', 0)
+        kwargs.setdefault('max_value', MAX_YEARS)
+        super().__init__(*args, **kwargs)
+
+
+class EmployeeFilter(django_filters.FilterSet):
+    """
+    Range filters for employees. Age and tenure are translated into
+    date_of_birth / hire_date ranges so they hit the column indexes
+    instead of computing a value per row.
+    """
+    age_min = YearsFilter(method='filter_age_min')
+    age_max = YearsFilter(method='filter_age_max')
+    tenure_min = YearsFilter(method='filter_tenure_min')
+    tenure_max = YearsFilter(method='filter_tenure_max')
+    salary_min = django_filters.NumberFilter(field_name='salary', lookup_expr='gte')
+    salary_max = django_filters.NumberFilter(field_name='salary', lookup_expr='lte')
+    hire_date_after = django_filters.DateFilter(field_name='hire_date', lookup_expr='gte')
+    hire_date_before = django_filters.DateFilter(field_name='hire_date', lookup_expr='lte')
+    # Direct reports; by column so it also applies to the archive table
+    manager = django_filters.NumberFilter(field_name='manager_id')
+    
+    class Meta:
+        model = Employee
+        fields = ['department', 'employment_status', 'gender']
+    
+    def filter_age_min(self, queryset, name, value):
+        return queryset.age_between(minimum=value)
+    
+    def filter_age_max(self, queryset, name, value):
+        return queryset.age_between(maximum=value)
+    
+    def filter_tenure_min(self, queryset, name, value):
+        return queryset.tenure_between(minimum=value)
+    
+    def filter_tenure_max(self, queryset, name, value):
+        return queryset.tenure_between(maximum=value)
+
+
+class ArchivedEmployeeFilter(EmployeeFilter):
+    """The same filters applied to the archive table"""
+    
+    class Meta(EmployeeFilter.Meta):
+        model = ArchivedEmployee
+
+
+class EmployeeFilterBackend(DjangoFilterBackend):
+    """
+    DjangoFilterBackend that also filters archived-employee querysets,
+    so ``?include_archived=`` results honour the list filters.
+    """
+    
+    def get_filterset_class(self, view, queryset=None):
+        if queryset is not None and queryset.model is ArchivedEmployee:
+            return ArchivedEmployeeFilter
+        return super().get_filterset_class(view, queryset)
+
+
+class EmployeeOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter that sorts the derived ``age`` and ``tenure`` fields
+    by their source date columns (older date = larger value), which is
+    the same order and can use the index.
+    """
+    derived_orderings = {
+        'age': '-date_of_birth',
+        'tenure': '-hire_date',
+    }
+    
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        return [self.translate(term) for term in ordering]
+    
+    def translate(self, term):
+        descending = term.startswith('-')
+        target = self.derived_orderings.get(term.lstrip('-'))
+        if target is None:
+            return term
+        if descending:
+            return target.lstrip('-') if target.startswith('-') else f'-{target}'
+        return target
@@ -0,0 +1,166 @@
+"""
+Reporting-line hierarchy stored as a closure table.
+
+EmployeeHierarchy holds a row for every (ancestor, descendant) pair, so
+"everyone under X", "X's chain of command" and aggregates over a subtree
+are each one indexed join, whatever the depth of the tree. The rows are
+kept current on insert and manager change by the Employee signal
+handlers, and on removal by ``remove_nodes()``, which the delete signal
+and the archive job call before the employee row goes.
+"""
+from django.db import connections, router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Employee, EmployeeHierarchy
+from . import audit
+
+
+def _quoted_table(connection):
+    return connection.ops.quote_name(EmployeeHierarchy._meta.db_table)
+
+
+def add_node(pk, manager_pk=None):
+    """Insert the paths of a new employee, a leaf under ``manager_pk``"""
+    rows = [EmployeeHierarchy(ancestor_id=pk, descendant_id=pk, depth=0)]
+    if manager_pk:
+        rows.extend(
+            EmployeeHierarchy(ancestor_id=ancestor, descendant_id=pk, depth=depth + 1)
+            for ancestor, depth in EmployeeHierarchy.objects.filter(
+                descendant_id=manager_pk
+            ).values_list('ancestor_id', 'depth')
+        )
+    EmployeeHierarchy.objects.bulk_create(rows)
+
+
+def move_node(pk, manager_pk=None):
+    """
+    Re-link the subtree rooted at ``pk`` under ``manager_pk`` (None makes
+    it a root). Two set-based statements however large the subtree is.
+    """
+    using = router.db_for_write(EmployeeHierarchy)
+    connection = connections[using]
+    table = _quoted_table(connection)
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        # Drop the paths from the old ancestors into the subtree
+        cursor.execute(
+            f'DELETE FROM {table} '
+            f'WHERE descendant_id IN (SELECT descendant_id FROM {table} WHERE ancestor_id = %s) '
+            f'AND ancestor_id IN (SELECT ancestor_id FROM {table} WHERE descendant_id = %s AND depth > 0)',
+            [pk, pk]
+        )
+        if manager_pk:
+            # Connect every new ancestor to every member of the subtree
+            cursor.execute(
+                f'INSERT INTO {table} (ancestor_id, descendant_id, depth) '
+                f'SELECT above.ancestor_id, below.descendant_id, above.depth + below.depth + 1 '
+                f'FROM {table} above CROSS JOIN {table} below '
+                f'WHERE above.descendant_id = %s AND below.ancestor_id = %s',
+                [manager_pk, pk]
+            )
+
+
+def remove_nodes(pks, user=None):
+    """
+    Detach employees that are about to be deleted or archived: their
+    direct reports move up to their manager, then their own paths are
+    removed. Must run before the employee rows themselves are deleted.
+    Each removed manager costs two closure-table statements however many
+    reports and descendants they have.
+    """
+    pks = list(pks)
+    managers_with_reports = set(
+        Employee.objects.filter(manager_id__in=pks).values_list('manager_id', flat=True)
+    )
+    using = router.db_for_write(EmployeeHierarchy)
+    connection = connections[using]
+    table = _quoted_table(connection)
+    employees = connection.ops.quote_name(Employee._meta.db_table)
+    for pk in pks:
+        if pk not in managers_with_reports:
+            continue
+        # Read fresh: an earlier iteration may have moved this employee
+        new_manager = Employee.objects.filter(pk=pk).values_list('manager_id', flat=True).first()
+        reports = Employee.objects.filter(manager_id=pk)
+        previous = list(reports.values_list('pk', 'manager_id'))
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            # Drop the paths from the employee and everyone above them
+            # into the subtrees of their reports
+            cursor.execute(
+                f'DELETE FROM {table} '
+                f'WHERE descendant_id IN (SELECT descendant_id FROM {table} WHERE ancestor_id = %s AND depth > 0) '
+                f'AND ancestor_id IN (SELECT ancestor_id FROM {table} WHERE descendant_id = %s)',
+                [pk, pk]
+            )
+            if new_manager:
+                # Connect the new manager and their ancestors to every
+                # report's subtree; reports still name ``pk`` as manager here
+                cursor.execute(
+                    f'INSERT INTO {table} (ancestor_id, descendant_id, depth) '
+                    f'SELECT above.ancestor_id, below.descendant_id, above.depth + below.depth + 1 '
+                    f'FROM {table} above CROSS JOIN {table} below '
+                    f'WHERE above.descendant_id = %s '
+                    f'AND below.ancestor_id IN (SELECT id FROM {employees} WHERE manager_id = %s)',
+                    [new_manager, pk]
+                )
+            reports.update(manager_id=new_manager, updated_at=timezone.now())
+        audit.record_bulk_change(previous, 'manager', new_manager, user)
+
+    EmployeeHierarchy.objects.filter(descendant_id__in=pks).delete()
+
+
+def rebuild_hierarchy():
+    """
+    Recompute the whole closure table from the manager column, e.g. after
+    a bulk import that bypassed the signal handlers. Builds one tree
+    level per statement and returns the number of rows written.
+    """
+    using = router.db_for_write(EmployeeHierarchy)
+    connection = connections[using]
+    table = _quoted_table(connection)
+    employees = connection.ops.quote_name(Employee._meta.db_table)
+    employee_count = Employee.objects.using(using).count()
+
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table}')
+        cursor.execute(
+            f'INSERT INTO {table} (ancestor_id, descendant_id, depth) '
+            f'SELECT id, id, 0 FROM {employees}'
+        )
+        written, depth = cursor.rowcount, 0
+        while True:
+            # Extend every path of length ``depth`` by one report
+            cursor.execute(
+                f'INSERT INTO {table} (ancestor_id, descendant_id, depth) '
+                f'SELECT above.ancestor_id, report.id, above.depth + 1 '
+                f'FROM {employees} report '
+                f'INNER JOIN {table} above ON above.descendant_id = report.manager_id '
+                f'WHERE above.depth = %s',
+                [depth]
+            )
+            if not cursor.rowcount:
+                return written
+            written += cursor.rowcount
+            depth += 1
+            if depth > employee_count:
+                raise ValueError('The manager column contains a reporting cycle.')
+
+
+def subtree(queryset, pk, max_depth=None):
+    """
+    Restrict ``queryset`` to the employees under ``pk`` at any depth (or
+    up to ``max_depth`` levels), annotated with their ``depth`` below it.
+    """
+    # One filter() call so every condition applies to the same closure row
+    conditions = {'ancestor_links__ancestor_id': pk, 'ancestor_links__depth__gt': 0}
+    if max_depth is not None:
+        conditions['ancestor_links__depth__lte'] = max_depth
+    return queryset.filter(**conditions).annotate(depth=F('ancestor_links__depth'))
+
+
+def chain_of_command(queryset, pk):
+    """Managers above ``pk`` from ``queryset``, nearest first, with ``depth``"""
+    return queryset.filter(
+        descendant_links__descendant_id=pk,
+        descendant_links__depth__gt=0
+    ).annotate(depth=F('descendant_links__depth')).order_by('depth')
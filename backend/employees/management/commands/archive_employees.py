@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from employees import archive
+
+
+class Command(BaseCommand):
+    help = (
+        'Move terminated employees past the retention period into the archive '
+        'table. Safe to interrupt: running it again continues where it stopped.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retention-days',
+            type=int,
+            help='Days since the last change (default: EMPLOYEE_ARCHIVE RETENTION_DAYS)'
+        )
+        parser.add_argument('--batch-size', type=int, help='Employees moved per transaction')
+        parser.add_argument('--max-batches', type=int, help='Stop after this many batches')
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0,
+            help='Seconds to sleep between batches'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many employees would be archived'
+        )
+
+    def handle(self, *args, **options):
+        candidates = archive.archive_candidates(retention_days=options['retention_days'])
+        if options['dry_run']:
+            self.stdout.write(f'{candidates.count()} employee(s) would be archived')
+            return
+
+        started = time.perf_counter()
+        total = 0
+        batches = archive.archive_in_batches(
+            candidates,
+            batch_size=options['batch_size'],
+            max_batches=options['max_batches'],
+            pause=options['pause']
+        )
+        for number, pks in enumerate(batches, start=1):
+            total += len(pks)
+            self.stdout.write(f'batch {number}: archived {len(pks)} (total {total})')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {total} employee(s) in {time.perf_counter() - started:.1f} s'
+        ))
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from employees import analytics
+from employees.models import Employee
+
+
+class Command(BaseCommand):
+    help = 'Time the columnar fetch and NumPy aggregation behind the compensation report'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument('--bins', type=int, default=10)
+
+    def handle(self, *args, **options):
+        for run in range(1, options['repeat'] + 1):
+            started = time.perf_counter()
+            columns = analytics.load_columns(Employee.objects.all())
+            fetched = time.perf_counter()
+            report = analytics.summarize_columns(columns, bins=options['bins'])
+            finished = time.perf_counter()
+
+            self.stdout.write(
+                f"run {run}: {len(columns['salary_cents'])} rows, "
+                f"fetch {(fetched - started) * 1000:.0f} ms, "
+                f"aggregate {(finished - fetched) * 1000:.0f} ms, "
+                f"total {(finished - started) * 1000:.0f} ms"
+            )
+
+        overall = report['overall']
+        if overall:
+            self.stdout.write(
+                f"total payroll {overall['total']}, median {overall['median']}, "
+                f"{sum(len(groups) for groups in report['groups'].values())} groups"
+            )
@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from employee_system.compression import available_encodings, compress
+from employees.models import Employee
+from employees.renderers import optional_renderer_classes
+from employees.serializers import EmployeeListSerializer, EmployeeSerializer
+
+
+class Command(BaseCommand):
+    help = 'Compare bytes-on-wire and CPU time per response for each renderer and encoding'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=50)
+        parser.add_argument(
+            '--detail',
+            action='store_true',
+            help='Serialize with the full EmployeeSerializer instead of the list serializer'
+        )
+
+    def handle(self, *args, **options):
+        serializer_class = EmployeeSerializer if options['detail'] else EmployeeListSerializer
+        employees = Employee.objects.select_related('created_by', 'updated_by')[:options['page_size']]
+        data = serializer_class(employees, many=True).data
+        repeat = options['repeat']
+
+        renderers = [JSONRenderer()] + [renderer() for renderer in optional_renderer_classes()]
+        self.stdout.write(
+            f"{len(data)} employees, {serializer_class.__name__}, {repeat} iterations\n"
+        )
+        self.stdout.write(f"{'format':<10}{'encoding':<10}{'bytes':>10}{'ratio':>8}{'ms/resp':>10}")
+
+        for renderer in renderers:
+            started = time.perf_counter()
+            for _ in range(repeat):
+                body = renderer.render(data)
+            render_ms = (time.perf_counter() - started) / repeat * 1000
+            self._row(renderer.format, 'identity', len(body), len(body), render_ms)
+
+            for encoding in available_encodings():
+                started = time.perf_counter()
+                for _ in range(repeat):
+                    compressed = compress(encoding, body)
+                elapsed_ms = (time.perf_counter() - started) / repeat * 1000
+                self._row(renderer.format, encoding, len(compressed), len(body), render_ms + elapsed_ms)
+
+    def _row(self, fmt, encoding, size, raw_size, milliseconds):
+        self.stdout.write(
+            f"{fmt:<10}{encoding:<10}{size:>10}{raw_size / size:>8.2f}{milliseconds:>10.3f}"
+        )
@@ -0,0 +1,56 @@
+import csv
+
+from django.core.management.base import BaseCommand
+
+from employees.duplicates import find_duplicates
+from employees.models import Employee
+
+
+class Command(BaseCommand):
+    help = 'Report pairs of employees that are probably the same person'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            help='Minimum score from 0 to 1 (default: DUPLICATE_DETECTION THRESHOLD)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Scoring processes (default: DUPLICATE_DETECTION WORKERS)'
+        )
+        parser.add_argument('--limit', type=int, default=50, help='Pairs to print (0 for all)')
+        parser.add_argument('--csv', help='Also write every pair to this CSV file')
+
+    def handle(self, *args, **options):
+        matches, stats = find_duplicates(threshold=options['threshold'], workers=options['workers'])
+
+        self.stdout.write(
+            f"{stats['employees']} employees, {stats['blocks']} blocks, "
+            f"{stats['candidate_pairs']} candidate pairs scored "
+            f"(instead of {stats['naive_pairs']}) in {stats['seconds']:.2f} s"
+        )
+        if stats['skipped_blocks']:
+            self.stdout.write(self.style.WARNING(
+                f"{stats['skipped_blocks']} oversized block(s) skipped; "
+                f"raise DUPLICATE_DETECTION MAX_BLOCK_SIZE to include them"
+            ))
+
+        shown = matches[:options['limit']] if options['limit'] else matches
+        pks = {pk for left, right, _, _ in shown for pk in (left, right)}
+        employees = Employee.objects.in_bulk(pks)
+        for left, right, score, reasons in shown:
+            self.stdout.write(
+                f"{score:.2f}  {employees.get(left, left)}  <->  {employees.get(right, right)}  "
+                f"[{', '.join(reasons)}]"
+            )
+
+        if options['csv']:
+            with open(options['csv'], 'w', newline='') as output:
+                writer = csv.writer(output)
+                writer.writerow(['employee', 'possible_duplicate', 'score', 'reasons'])
+                for left, right, score, reasons in matches:
+                    writer.writerow([left, right, score, ' '.join(reasons)])
+
+        self.stdout.write(self.style.SUCCESS(f"{stats['matches']} possible duplicate pair(s)"))
@@ -0,0 +1,155 @@
+import statistics
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count
+
+from employees import hierarchy
+from employees.models import Employee, EmployeeHierarchy
+from employees.serializers import OrgChartSerializer
+
+DEPARTMENTS = [code for code, _ in Employee.DEPARTMENT_CHOICES]
+
+
+class Command(BaseCommand):
+    help = (
+        'Build a synthetic org tree and time the closure-table queries behind '
+        'the subtree, chain and subtree_headcount endpoints. Everything is '
+        'rolled back afterwards unless --keep is given.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--nodes', type=int, default=100000)
+        parser.add_argument('--branching', type=int, default=8, help='Direct reports per manager')
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--explain', action='store_true', help='Print the query plans')
+        parser.add_argument('--keep', action='store_true', help='Commit the synthetic tree')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            levels = self.build_tree(options['nodes'], options['branching'])
+            self.run(levels, options)
+            if not options['keep']:
+                transaction.set_rollback(True)
+
+    def build_tree(self, nodes, branching):
+        """Insert ``nodes`` employees level by level; return their pks per level"""
+        started = time.perf_counter()
+        levels, created = [], 0
+        while created < nodes:
+            parents = levels[-1] if levels else [None]
+            size = min(len(parents) * branching if levels else 1, nodes - created)
+            employees = [
+                self.synthetic_employee(created + index, parents[index // branching] if levels else None)
+                for index in range(size)
+            ]
+            employees = Employee.objects.bulk_create(employees, batch_size=2000)
+            if employees[0].pk is None:
+                raise CommandError('This database does not return primary keys from bulk inserts.')
+            levels.append([employee.pk for employee in employees])
+            created += size
+        self.stdout.write(
+            f'Inserted {created} employees in {len(levels)} levels '
+            f'({time.perf_counter() - started:.1f} s)'
+        )
+
+        started = time.perf_counter()
+        rows = hierarchy.rebuild_hierarchy()
+        self.stdout.write(f'Closure table: {rows} rows built in {time.perf_counter() - started:.1f} s')
+        return levels
+
+    @staticmethod
+    def synthetic_employee(index, manager_pk):
+        return Employee(
+            employee_id=f'EMP9{index:08d}',
+            first_name=f'Bench{index % 997}',
+            last_name=f'Node{index}',
+            email=f'node{index}@bench.invalid',
+            phone='+10000000000',
+            date_of_birth=date(1970 + index % 30, 1 + index % 12, 1 + index % 28),
+            gender='MFO'[index % 3],
+            address='-',
+            department=DEPARTMENTS[index % len(DEPARTMENTS)],
+            position='Engineer',
+            hire_date=date(2000 + index % 24, 1 + index % 12, 1 + index % 28),
+            salary=50000 + index % 50000,
+            emergency_contact_name='-',
+            emergency_contact_phone='+10000000001',
+            emergency_contact_relationship='-',
+            manager_id=manager_pk,
+        )
+
+    def timed(self, label, function, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = function()
+            timings.append(time.perf_counter() - started)
+        self.stdout.write(
+            f'  {label:<40} median {statistics.median(timings) * 1000:8.2f} ms'
+            f'   max {max(timings) * 1000:8.2f} ms'
+        )
+        return result
+
+    def run(self, levels, options):
+        repeat = options['repeat']
+        employees = Employee.objects.only(*OrgChartSerializer.columns)
+        root, middle, leaf = levels[0][0], levels[min(2, len(levels) - 1)][0], levels[-1][-1]
+
+        def subtree_page(pk):
+            return list(hierarchy.subtree(employees, pk).order_by(
+                'depth', 'last_name', 'first_name', 'id'
+            )[:10])
+
+        def headcount(pk):
+            return list(hierarchy.subtree(Employee.objects.all(), pk).order_by().values(
+                'department'
+            ).annotate(headcount=Count('id')))
+
+        def per_level_subtree(pk):
+            # What the closure table replaces: one query per level
+            found, frontier, queries = 0, [pk], 0
+            while frontier:
+                frontier = list(Employee.objects.filter(manager_id__in=frontier).values_list('pk', flat=True))
+                found += len(frontier)
+                queries += 1
+            return found, queries
+
+        self.stdout.write('Queries:')
+        size = self.timed('subtree(root) count', lambda: hierarchy.subtree(employees, root).count(), repeat)
+        self.timed('subtree(root) first page', lambda: subtree_page(root), repeat)
+        self.timed('subtree(level 2) first page', lambda: subtree_page(middle), repeat)
+        self.timed('subtree_headcount(root)', lambda: headcount(root), repeat)
+        self.timed('subtree_headcount(level 2)', lambda: headcount(middle), repeat)
+        chain = self.timed('chain(deepest leaf)', lambda: list(hierarchy.chain_of_command(employees, leaf)), repeat)
+        found, queries = self.timed(
+            'per-level subtree(root), for comparison', lambda: per_level_subtree(root), max(1, repeat // 5)
+        )
+        self.stdout.write(
+            f'  root subtree: {size} employees; chain length {len(chain)}; '
+            f'per-level walk needed {queries} queries for {found} employees'
+        )
+
+        self.stdout.write('Writes:')
+        moved, new_manager = levels[min(2, len(levels) - 1)][0], levels[1][-1]
+        old_manager = Employee.objects.get(pk=moved).manager_id
+        subtree_size = hierarchy.subtree(employees, moved).count() + 1
+        self.timed(
+            f'move {subtree_size}-employee subtree',
+            lambda: hierarchy.move_node(moved, new_manager),
+            1
+        )
+        self.timed('move it back', lambda: hierarchy.move_node(moved, old_manager), 1)
+        leaf_employee = Employee.objects.bulk_create([self.synthetic_employee(options['nodes'], leaf)])[0]
+        self.timed('add leaf', lambda: hierarchy.add_node(leaf_employee.pk, leaf), 1)
+        self.stdout.write(f'  closure rows: {EmployeeHierarchy.objects.count()}')
+
+        if options['explain']:
+            self.stdout.write('Plans:')
+            for label, queryset in [
+                ('subtree', hierarchy.subtree(employees, root).order_by('depth')[:10]),
+                ('chain', hierarchy.chain_of_command(employees, leaf)),
+            ]:
+                self.stdout.write(f'  {label}: {queryset.explain()}')
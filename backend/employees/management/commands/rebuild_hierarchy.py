@@ -0,0 +1,16 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from employees.hierarchy import rebuild_hierarchy
+
+
+class Command(BaseCommand):
+    help = 'Recompute the reporting-line closure table from the manager column'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        rows = rebuild_hierarchy()
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {rows} hierarchy rows in {time.perf_counter() - started:.1f} s'
+        ))
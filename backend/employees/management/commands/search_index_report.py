@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from employees.search_index import employee_index
+
+
+class Command(BaseCommand):
+    help = 'Build the autocomplete prefix index and report its size and lookup latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'prefixes',
+            nargs='*',
+            default=['a', 'jo', 'emp0', 'smith'],
+            help='Prefixes to time lookups for'
+        )
+        parser.add_argument('--repeat', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        build_seconds = employee_index.build()
+        stats = employee_index.stats()
+
+        self.stdout.write(f"Built in {build_seconds * 1000:.1f} ms")
+        self.stdout.write(f"Employees: {stats['employees']}  keys: {stats['keys']}")
+        self.stdout.write(
+            f"Memory: {stats['total_bytes'] / 1024 / 1024:.2f} MiB "
+            f"(keys {stats['key_bytes'] / 1024 / 1024:.2f} MiB, "
+            f"entries {stats['entry_bytes'] / 1024 / 1024:.2f} MiB)"
+        )
+
+        repeat = options['repeat']
+        for prefix in options['prefixes']:
+            started = time.perf_counter()
+            for _ in range(repeat):
+                matches = employee_index.lookup(prefix)
+            elapsed = (time.perf_counter() - started) / repeat
+            self.stdout.write(f"  {prefix!r}: {len(matches)} matches, {elapsed * 1e6:.1f} us/lookup")
@@ -0,0 +1,98 @@
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+class Command(BaseCommand):
+    help = (
+        'Profile worker startup: time spent importing each package, and the '
+        'first-request latency of a cold worker with and without warm-up'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths',
+            nargs='*',
+            default=['/api/employees/'],
+            help='API paths to request after boot'
+        )
+        parser.add_argument('--runs', type=int, default=3, help='Worker starts per mode (median reported)')
+        parser.add_argument('--top', type=int, default=15, help='Packages to list in the import profile')
+        parser.add_argument('--username', help='User the requests are made as (default: first superuser)')
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, STARTUP_PROBE_TOKEN=self.token(options['username']))
+
+        stderr = self.probe(options['paths'], env, ['-X', 'importtime'])[1]
+        self.report_imports(stderr, options['top'])
+
+        for warm in (False, True):
+            runs = [
+                json.loads(self.probe(options['paths'], env, [], warm=warm)[0].splitlines()[-1])
+                for _ in range(options['runs'])
+            ]
+            self.report_runs('Warm start' if warm else 'Cold start', runs)
+
+    def token(self, username):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        users = User.objects.filter(is_active=True)
+        user = users.filter(username=username).first() if username else users.filter(is_superuser=True).first()
+        if user is None:
+            if username:
+                raise CommandError(f'No active user named {username}')
+            self.stdout.write(self.style.WARNING(
+                'No superuser found: requests are unauthenticated and stop at the 401'
+            ))
+            return ''
+        return str(AccessToken.for_user(user))
+
+    def probe(self, paths, env, python_options, warm=False):
+        command = [sys.executable, *python_options, '-m', 'employee_system.startup_probe', *paths]
+        if warm:
+            command.insert(-len(paths), '--warm')
+        result = subprocess.run(command, cwd=settings.BASE_DIR, env=env, capture_output=True, text=True)
+        if result.returncode:
+            raise CommandError(f'Startup probe failed:\n{result.stderr}')
+        return result.stdout, result.stderr
+
+    def report_imports(self, stderr, top):
+        """Sum -X importtime self times per top-level package"""
+        per_package = defaultdict(int)
+        modules = 0
+        for line in stderr.splitlines():
+            match = IMPORT_LINE.match(line)
+            if match:
+                modules += 1
+                per_package[match.group(4).split('.')[0]] += int(match.group(1))
+        total = sum(per_package.values())
+        self.stdout.write(f'Imports during boot and first requests: {modules} modules, {total / 1000:.0f} ms')
+        for package, microseconds in sorted(per_package.items(), key=lambda item: -item[1])[:top]:
+            self.stdout.write(f'  {package:<32} {microseconds / 1000:7.1f} ms')
+
+    def report_runs(self, label, runs):
+        median = statistics.median
+        boot = median([run['boot'] for run in runs])
+        warm_up = median([run['warm_up'] for run in runs])
+        self.stdout.write(
+            f'{label} (median of {len(runs)}): boot {boot:.0f} ms'
+            + (f' + warm-up {warm_up:.0f} ms' if warm_up else '')
+        )
+        for path, result in runs[0]['requests'].items():
+            first = median([run['requests'][path]['first'] for run in runs])
+            second = median([run['requests'][path]['second'] for run in runs])
+            self.stdout.write(
+                f'  GET {path} [{result["status"]}]: first {first:.1f} ms, second {second:.1f} ms'
+            )
+        loaded = [name for name, is_loaded in runs[0]['loaded'].items() if is_loaded]
+        self.stdout.write(f'  Loaded optional modules: {", ".join(loaded) or "none"}')
@@ -0,0 +1,36 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        'Copy the SQLite primary database into every SQLite replica. '
+        'Stands in for replication when testing replica routing locally.'
+    )
+
+    def handle(self, *args, **options):
+        primary = settings.DATABASES['default']
+        if primary['ENGINE'] != 'django.db.backends.sqlite3':
+            raise CommandError('The default database is not SQLite.')
+
+        replicas = [
+            (alias, config) for alias, config in settings.DATABASES.items()
+            if alias != 'default' and config['ENGINE'] == 'django.db.backends.sqlite3'
+        ]
+        if not replicas:
+            raise CommandError('No SQLite replicas configured; set DATABASE_REPLICA_URLS.')
+
+        # uri=True as Django connects, so in-memory test databases work too
+        source = sqlite3.connect(str(primary['NAME']), uri=True)
+        try:
+            for alias, config in replicas:
+                target = sqlite3.connect(str(config['NAME']), uri=True)
+                try:
+                    source.backup(target)
+                finally:
+                    target.close()
+                self.stdout.write(f"Copied {primary['NAME']} -> {config['NAME']} ({alias})")
+        finally:
+            source.close()
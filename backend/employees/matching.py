@@ -0,0 +1,134 @@
+"""
+Blocking keys and pair scoring for duplicate-employee detection.
+
+Comparing every employee with every other one is O(n^2). Instead each
+employee gets a few blocking keys, stored as indexed columns on the
+Employee table, and only employees sharing a key are compared:
+
+- ``phone_key``: the phone number's digits without a leading country code
+- ``name_dob_key``: the Soundex code of the last name plus date of birth
+- ``email_key``: the email local part without dots or a ``+tag``
+
+This module imports nothing from Django so process-pool workers can
+score blocks without setting up the project.
+"""
+import re
+from difflib import SequenceMatcher
+
+BLOCKING_FIELDS = ['phone_key', 'name_dob_key', 'email_key']
+
+# Employee fields each blocking key is derived from
+KEY_SOURCES = {
+    'phone_key': {'phone'},
+    'name_dob_key': {'last_name', 'date_of_birth'},
+    'email_key': {'email'},
+}
+
+# Row fields the scorer reads
+MATCH_FIELDS = ['id', 'first_name', 'last_name', 'date_of_birth', *BLOCKING_FIELDS]
+
+# Contribution of each signal to the 0-1 score
+WEIGHTS = {
+    'name': 0.4,
+    'date_of_birth': 0.25,
+    'phone': 0.2,
+    'email': 0.15,
+}
+
+SOUNDEX_CODES = {
+    **dict.fromkeys('bfpv', '1'),
+    **dict.fromkeys('cgjkqsxz', '2'),
+    **dict.fromkeys('dt', '3'),
+    'l': '4',
+    **dict.fromkeys('mn', '5'),
+    'r': '6',
+}
+
+
+def normalize_phone(phone):
+    """Last ten digits of ``phone``, or '' when it has too few to compare"""
+    digits = re.sub(r'\D', '', phone or '')
+    return digits[-10:] if len(digits) >= 9 else ''
+
+
+def soundex(name):
+    """American Soundex code of ``name`` ('' for a name without letters)"""
+    letters = [char for char in (name or '').lower() if 'a' <= char <= 'z']
+    if not letters:
+        return ''
+    code = letters[0].upper()
+    previous = SOUNDEX_CODES.get(letters[0], '')
+    for char in letters[1:]:
+        digit = SOUNDEX_CODES.get(char, '')
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # h and w do not separate letters with the same code; vowels do
+        if char not in 'hw':
+            previous = digit
+    return code.ljust(4, '0')
+
+
+def email_local_part(email):
+    """Lower-cased local part of ``email`` without dots or a +tag"""
+    local = (email or '').split('@', 1)[0].lower()
+    return local.split('+', 1)[0].replace('.', '')
+
+
+def blocking_keys(first_name, last_name, email, phone, date_of_birth):
+    """Return the BLOCKING_FIELDS values for an employee"""
+    name_code = soundex(last_name)
+    return {
+        'phone_key': normalize_phone(phone),
+        'name_dob_key': f'{name_code}:{date_of_birth.isoformat()}' if name_code and date_of_birth else '',
+        'email_key': email_local_part(email),
+    }
+
+
+def _name(row):
+    return f"{row['first_name']} {row['last_name']}".lower().strip()
+
+
+def score_pair(left, right):
+    """
+    Score how likely two employee rows are the same person, from 0 to 1,
+    and name the signals that matched.
+    """
+    reasons = []
+    name_similarity = SequenceMatcher(None, _name(left), _name(right)).ratio()
+    score = WEIGHTS['name'] * name_similarity
+    if name_similarity >= 0.85:
+        reasons.append('name')
+    if left['date_of_birth'] and left['date_of_birth'] == right['date_of_birth']:
+        score += WEIGHTS['date_of_birth']
+        reasons.append('date_of_birth')
+    if left['phone_key'] and left['phone_key'] == right['phone_key']:
+        score += WEIGHTS['phone']
+        reasons.append('phone')
+    if left['email_key'] and left['email_key'] == right['email_key']:
+        score += WEIGHTS['email']
+        reasons.append('email')
+    return round(score, 3), reasons
+
+
+def score_blocks(blocks, threshold):
+    """
+    Score every pair inside each block and return the matches at or above
+    ``threshold`` as (lower id, higher id, score, reasons) tuples. Runs in
+    the process-pool workers.
+    """
+    matches = []
+    seen = set()
+    for rows in blocks:
+        for index, left in enumerate(rows):
+            for right in rows[index + 1:]:
+                pair = (left['id'], right['id']) if left['id'] < right['id'] else (right['id'], left['id'])
+                # A pair sharing several keys appears in several blocks
+                if pair in seen:
+                    continue
+                seen.add(pair)
+                score, reasons = score_pair(left, right)
+                if score >= threshold:
+                    matches.append((*pair, score, reasons))
+    return matches
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:01
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('employees', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeAuditLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.CharField(choices=[('CREATE', 'Create'), ('UPDATE', 'Update'), ('STATUS_CHANGE', 'Status Change'), ('DELETE', 'Delete')], max_length=20)),
+                ('changes', models.JSONField(default=dict)),
+                ('changed_at', models.DateTimeField()),
+                ('changed_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='employee_audit_logs', to=settings.AUTH_USER_MODEL)),
+                ('employee', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='audit_logs', to='employees.employee')),
+            ],
+            options={
+                'ordering': ['-id'],
+                'indexes': [models.Index(fields=['employee', '-id'], name='employees_e_employe_1a06f0_idx')],
+            },
+        ),
+    ]
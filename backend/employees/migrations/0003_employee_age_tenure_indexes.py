@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0002_employeeauditlog'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['date_of_birth'], name='employees_e_date_of_a94ce3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['hire_date'], name='employees_e_hire_da_c2151e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['salary'], name='employees_e_salary_63d04b_idx'),
+        ),
+    ]
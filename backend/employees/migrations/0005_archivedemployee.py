@@ -0,0 +1,55 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:20
+
+from django.conf import settings
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('employees', '0004_employee_admin_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='employeeauditlog',
+            name='action',
+            field=models.CharField(choices=[('CREATE', 'Create'), ('UPDATE', 'Update'), ('STATUS_CHANGE', 'Status Change'), ('DELETE', 'Delete'), ('ARCHIVE', 'Archive'), ('RESTORE', 'Restore')], max_length=20),
+        ),
+        migrations.CreateModel(
+            name='ArchivedEmployee',
+            fields=[
+                ('first_name', models.CharField(max_length=100)),
+                ('last_name', models.CharField(max_length=100)),
+                ('phone', models.CharField(max_length=15, validators=[django.core.validators.RegexValidator(message='Phone number must be entered in the format: +999999999', regex='^\\+?1?\\d{9,15}$')])),
+                ('date_of_birth', models.DateField()),
+                ('gender', models.CharField(choices=[('M', 'Male'), ('F', 'Female'), ('O', 'Other')], max_length=1)),
+                ('address', models.TextField()),
+                ('department', models.CharField(choices=[('HR', 'Human Resources'), ('IT', 'Information Technology'), ('FIN', 'Finance'), ('MKT', 'Marketing'), ('OPS', 'Operations'), ('SALES', 'Sales'), ('ENG', 'Engineering')], max_length=10)),
+                ('position', models.CharField(max_length=100)),
+                ('hire_date', models.DateField()),
+                ('salary', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('employment_status', models.CharField(choices=[('ACTIVE', 'Active'), ('INACTIVE', 'Inactive'), ('ON_LEAVE', 'On Leave'), ('TERMINATED', 'Terminated')], default='ACTIVE', max_length=20)),
+                ('emergency_contact_name', models.CharField(max_length=200)),
+                ('emergency_contact_phone', models.CharField(max_length=15, validators=[django.core.validators.RegexValidator(message='Phone number must be entered in the format: +999999999', regex='^\\+?1?\\d{9,15}$')])),
+                ('emergency_contact_relationship', models.CharField(max_length=100)),
+                ('profile_picture', models.ImageField(blank=True, null=True, upload_to='employee_profiles/')),
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('employee_id', models.CharField(db_index=True, max_length=20)),
+                ('email', models.EmailField(db_index=True, max_length=254)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField()),
+                ('archived_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('updated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['last_name', 'first_name'], name='employees_a_last_na_62fc6d_idx'), models.Index(fields=['department'], name='employees_a_departm_a8acc4_idx'), models.Index(fields=['archived_at'], name='employees_a_archive_ddb082_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def add_self_paths(apps, schema_editor):
+    """Every existing employee starts as the root of its own tree"""
+    Employee = apps.get_model('employees', 'Employee')
+    EmployeeHierarchy = apps.get_model('employees', 'EmployeeHierarchy')
+    db_alias = schema_editor.connection.alias
+    rows = []
+    for pk in Employee.objects.using(db_alias).values_list('pk', flat=True).iterator(chunk_size=5000):
+        rows.append(EmployeeHierarchy(ancestor_id=pk, descendant_id=pk, depth=0))
+        if len(rows) >= 5000:
+            EmployeeHierarchy.objects.using(db_alias).bulk_create(rows)
+            rows = []
+    EmployeeHierarchy.objects.using(db_alias).bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0005_archivedemployee'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedemployee',
+            name='manager_id',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='employee',
+            name='manager',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='direct_reports', to='employees.employee'),
+        ),
+        migrations.CreateModel(
+            name='EmployeeHierarchy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField()),
+                ('ancestor', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='descendant_links', to='employees.employee')),
+                ('descendant', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='ancestor_links', to='employees.employee')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['ancestor', 'depth', 'descendant'], name='employees_e_ancesto_9d80ab_idx'), models.Index(fields=['descendant', 'depth', 'ancestor'], name='employees_e_descend_c28ad9_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='employeehierarchy',
+            constraint=models.UniqueConstraint(fields=('ancestor', 'descendant'), name='unique_hierarchy_path'),
+        ),
+        migrations.RunPython(add_self_paths, migrations.RunPython.noop),
+    ]
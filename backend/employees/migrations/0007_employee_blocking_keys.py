@@ -0,0 +1,128 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:32
+
+import re
+
+from django.db import migrations, models
+
+# Frozen copies of employees.matching as of this migration, so later
+# changes to the live key functions do not change what it computes
+
+BLOCKING_FIELDS = ['phone_key', 'name_dob_key', 'email_key']
+
+SOUNDEX_CODES = {
+    **dict.fromkeys('bfpv', '1'),
+    **dict.fromkeys('cgjkqsxz', '2'),
+    **dict.fromkeys('dt', '3'),
+    'l': '4',
+    **dict.fromkeys('mn', '5'),
+    'r': '6',
+}
+
+
+def normalize_phone(phone):
+    digits = re.sub(r'\D', '', phone or '')
+    return digits[-10:] if len(digits) >= 9 else ''
+
+
+def soundex(name):
+    letters = [char for char in (name or '').lower() if 'a' <= char <= 'z']
+    if not letters:
+        return ''
+    code = letters[0].upper()
+    previous = SOUNDEX_CODES.get(letters[0], '')
+    for char in letters[1:]:
+        digit = SOUNDEX_CODES.get(char, '')
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        if char not in 'hw':
+            previous = digit
+    return code.ljust(4, '0')
+
+
+def email_local_part(email):
+    local = (email or '').split('@', 1)[0].lower()
+    return local.split('+', 1)[0].replace('.', '')
+
+
+def blocking_keys(first_name, last_name, email, phone, date_of_birth):
+    name_code = soundex(last_name)
+    return {
+        'phone_key': normalize_phone(phone),
+        'name_dob_key': f'{name_code}:{date_of_birth.isoformat()}' if name_code and date_of_birth else '',
+        'email_key': email_local_part(email),
+    }
+
+
+def fill_blocking_keys(apps, schema_editor):
+    """Compute the keys for rows saved before the columns existed"""
+    db_alias = schema_editor.connection.alias
+    for model_name in ['Employee', 'ArchivedEmployee']:
+        model = apps.get_model('employees', model_name)
+        rows = []
+        for row in model.objects.using(db_alias).only(
+            'first_name', 'last_name', 'email', 'phone', 'date_of_birth'
+        ).iterator(chunk_size=2000):
+            for name, value in blocking_keys(
+                row.first_name, row.last_name, row.email, row.phone, row.date_of_birth
+            ).items():
+                setattr(row, name, value)
+            rows.append(row)
+            if len(rows) >= 2000:
+                model.objects.using(db_alias).bulk_update(rows, BLOCKING_FIELDS)
+                rows = []
+        model.objects.using(db_alias).bulk_update(rows, BLOCKING_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0006_employee_hierarchy'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedemployee',
+            name='email_key',
+            field=models.CharField(blank=True, editable=False, max_length=254),
+        ),
+        migrations.AddField(
+            model_name='archivedemployee',
+            name='name_dob_key',
+            field=models.CharField(blank=True, editable=False, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='archivedemployee',
+            name='phone_key',
+            field=models.CharField(blank=True, editable=False, max_length=15),
+        ),
+        migrations.AddField(
+            model_name='employee',
+            name='email_key',
+            field=models.CharField(blank=True, editable=False, max_length=254),
+        ),
+        migrations.AddField(
+            model_name='employee',
+            name='name_dob_key',
+            field=models.CharField(blank=True, editable=False, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='employee',
+            name='phone_key',
+            field=models.CharField(blank=True, editable=False, max_length=15),
+        ),
+        migrations.RunPython(fill_blocking_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['phone_key'], name='employees_e_phone_k_e2120a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['name_dob_key'], name='employees_e_name_do_1ebfec_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['email_key'], name='employees_e_email_k_a6f0aa_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0007_employee_blocking_keys'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['department', 'position', 'hire_date', 'salary'], name='employees_e_departm_b4232d_idx'),
+        ),
+    ]
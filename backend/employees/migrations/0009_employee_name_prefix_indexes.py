@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:04
+
+from django.db import migrations
+import django.db.models.functions.text
+import employees.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0008_employee_compensation_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=employees.models.PrefixSearchIndex(django.db.models.functions.text.Upper('last_name'), name='employee_last_name_upper_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=employees.models.PrefixSearchIndex(django.db.models.functions.text.Upper('first_name'), name='employee_first_name_upper_idx'),
+        ),
+    ]
@@ -1,9 +1,86 @@
 from django.db import models
 from django.core.validators import EmailValidator, RegexValidator
 from django.core.exceptions import ValidationError
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.functions import ExtractYear, Upper
 from datetime import date
 
-class Employee(models.Model):
+from .matching import KEY_SOURCES, blocking_keys
+
+
+def years_before(day, years):
+    """The same calendar day ``years`` years earlier (Feb 29 -> Feb 28)"""
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        return day.replace(year=day.year - years, day=28)
+
+
+def completed_years(field, today):
+    """SQL expression for whole years elapsed between ``field`` and ``today``"""
+    before_anniversary = (
+        Q(**{f'{field}__month__gt': today.month})
+        | Q(**{f'{field}__month': today.month, f'{field}__day__gt': today.day})
+    )
+    return Value(today.year) - ExtractYear(field) - Case(
+        When(before_anniversary, then=Value(1)),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+class PrefixSearchIndex(models.Index):
+    """
+    Expression index that also serves ``LIKE 'PREFIX%'`` lookups. A plain
+    B-tree only does so on PostgreSQL with the C collation, so there the
+    expressions get the text_pattern_ops operator class.
+    """
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        if schema_editor.connection.vendor != 'postgresql':
+            return super().create_sql(model, schema_editor, using=using, **kwargs)
+        from django.contrib.postgres.indexes import OpClass
+        index = models.Index(
+            *[OpClass(expression, name='text_pattern_ops') for expression in self.expressions],
+            name=self.name
+        )
+        return index.create_sql(model, schema_editor, using=using, **kwargs)
+
+
+class EmployeeQuerySet(models.QuerySet):
+    def with_age_and_tenure(self, today=None):
+        """Annotate age_years and tenure_years computed by the database"""
+        today = today or date.today()
+        return self.annotate(
+            age_years=completed_years('date_of_birth', today),
+            tenure_years=completed_years('hire_date', today),
+        )
+    
+    def age_between(self, minimum=None, maximum=None, today=None):
+        """Filter on age as a date_of_birth range so the index can be used"""
+        today = today or date.today()
+        queryset = self
+        if minimum is not None:
+            queryset = queryset.filter(date_of_birth__lte=years_before(today, minimum))
+        if maximum is not None:
+            queryset = queryset.filter(date_of_birth__gt=years_before(today, maximum + 1))
+        return queryset
+    
+    def tenure_between(self, minimum=None, maximum=None, today=None):
+        """Filter on completed years of service as a hire_date range"""
+        today = today or date.today()
+        queryset = self
+        if minimum is not None:
+            queryset = queryset.filter(hire_date__lte=years_before(today, minimum))
+        if maximum is not None:
+            queryset = queryset.filter(hire_date__gt=years_before(today, maximum + 1))
+        return queryset
+
+
+class EmployeeRecord(models.Model):
+    """
+    Fields shared by live employees and their archived copies, so the two
+    tables can never drift apart.
+    """
     GENDER_CHOICES = [
         ('M', 'Male'),
         ('F', 'Female'),
@@ -28,20 +105,8 @@ class Employee(models.Model):
     ]
     
     # Personal Information
-    employee_id = models.CharField(
-        max_length=20,
-        unique=True,
-        validators=[RegexValidator(
-            regex=r'^EMP\d{4,}$',
-            message='Employee ID must be in format: EMP0001'
-        )]
-    )
     first_name = models.CharField(max_length=100)
     last_name = models.CharField(max_length=100)
-    email = models.EmailField(
-        unique=True,
-        validators=[EmailValidator()]
-    )
     phone = models.CharField(
         max_length=15,
         validators=[RegexValidator(
@@ -82,6 +147,55 @@ class Employee(models.Model):
         blank=True
     )
     
+    # Duplicate-detection blocking keys, derived from the fields above on save
+    phone_key = models.CharField(max_length=15, blank=True, editable=False)
+    name_dob_key = models.CharField(max_length=20, blank=True, editable=False)
+    email_key = models.CharField(max_length=254, blank=True, editable=False)
+    
+    objects = EmployeeQuerySet.as_manager()
+    
+    class Meta:
+        abstract = True
+    
+    @property
+    def full_name(self):
+        return f"{self.first_name} {self.last_name}"
+    
+    @property
+    def age(self):
+        today = date.today()
+        return today.year - self.date_of_birth.year - (
+            (today.month, today.day) < (self.date_of_birth.month, self.date_of_birth.day)
+        )
+    
+    @property
+    def tenure(self):
+        today = date.today()
+        return today.year - self.hire_date.year - (
+            (today.month, today.day) < (self.hire_date.month, self.hire_date.day)
+        )
+    
+    def update_blocking_keys(self):
+        for name, value in blocking_keys(
+            self.first_name, self.last_name, self.email, self.phone, self.date_of_birth
+        ).items():
+            setattr(self, name, value)
+
+
+class Employee(EmployeeRecord):
+    employee_id = models.CharField(
+        max_length=20,
+        unique=True,
+        validators=[RegexValidator(
+            regex=r'^EMP\d{4,}$',
+            message='Employee ID must be in format: EMP0001'
+        )]
+    )
+    email = models.EmailField(
+        unique=True,
+        validators=[EmailValidator()]
+    )
+    
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -98,12 +212,37 @@ class Employee(models.Model):
         related_name='updated_employees'
     )
     
+    # Reporting line. Reports are moved up to the next manager by
+    # hierarchy.remove_nodes() before an employee is deleted or archived,
+    # so the database never needs to cascade or null this column.
+    manager = models.ForeignKey(
+        'self',
+        on_delete=models.DO_NOTHING,
+        null=True,
+        blank=True,
+        related_name='direct_reports'
+    )
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['employee_id']),
             models.Index(fields=['email']),
             models.Index(fields=['department']),
+            models.Index(fields=['date_of_birth']),
+            models.Index(fields=['hire_date']),
+            models.Index(fields=['salary']),
+            models.Index(fields=['employment_status']),
+            models.Index(fields=['last_name', 'first_name']),
+            models.Index(fields=['first_name']),
+            models.Index(fields=['phone_key']),
+            models.Index(fields=['name_dob_key']),
+            models.Index(fields=['email_key']),
+            # Covers the compensation report's grouped scan
+            models.Index(fields=['department', 'position', 'hire_date', 'salary']),
+            # Case-insensitive name prefix search in the admin
+            PrefixSearchIndex(Upper('last_name'), name='employee_last_name_upper_idx'),
+            PrefixSearchIndex(Upper('first_name'), name='employee_first_name_upper_idx'),
         ]
     
     def clean(self):
@@ -123,21 +262,145 @@ class Employee(models.Model):
         # Validate salary (must be positive)
         if self.salary and self.salary <= 0:
             raise ValidationError({'salary': 'Salary must be greater than zero.'})
+        
+        # Validate reporting line (no cycles)
+        if self.manager_id and self.pk and EmployeeHierarchy.objects.filter(
+            ancestor_id=self.pk, descendant_id=self.manager_id
+        ).exists():
+            raise ValidationError({'manager': 'An employee cannot report to themselves or to one of their reports.'})
     
     def save(self, *args, **kwargs):
         self.full_clean()
+        self.update_blocking_keys()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            # Write the keys derived from the fields being saved
+            kwargs['update_fields'] = {*update_fields, *(
+                key for key, sources in KEY_SOURCES.items() if sources & set(update_fields)
+            )}
         super().save(*args, **kwargs)
     
     def __str__(self):
         return f"{self.employee_id} - {self.first_name} {self.last_name}"
+
+
+class ArchivedEmployee(EmployeeRecord):
+    """
+    Terminated employee moved out of the live table by the archive job.
+    The primary key is the original Employee id, so audit history and
+    restores keep the same identity.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    # Not unique: a live employee may reuse an archived ID or email
+    employee_id = models.CharField(max_length=20, db_index=True)
+    email = models.EmailField(db_index=True)
     
-    @property
-    def full_name(self):
-        return f"{self.first_name} {self.last_name}"
+    # Original metadata, copied verbatim
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    created_by = models.ForeignKey(
+        'auth.User',
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+'
+    )
+    updated_by = models.ForeignKey(
+        'auth.User',
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+'
+    )
     
-    @property
-    def age(self):
-        today = date.today()
-        return today.year - self.date_of_birth.year - (
-            (today.month, today.day) < (self.date_of_birth.month, self.date_of_birth.day)
-        )
+    # Plain column: the manager may itself be archived or deleted later
+    manager_id = models.BigIntegerField(null=True, blank=True)
+    
+    archived_at = models.DateTimeField()
+    archived_by = models.ForeignKey(
+        'auth.User',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['last_name', 'first_name']),
+            models.Index(fields=['department']),
+            models.Index(fields=['archived_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.employee_id} - {self.first_name} {self.last_name} (archived)"
+
+
+class EmployeeHierarchy(models.Model):
+    """
+    Closure table of the reporting lines: one row per (ancestor,
+    descendant) pair, including every employee paired with itself at
+    depth 0. Maintained by the functions in ``hierarchy.py``.
+    """
+    # The composite indexes below lead with these columns
+    ancestor = models.ForeignKey(
+        Employee,
+        on_delete=models.DO_NOTHING,
+        db_index=False,
+        related_name='descendant_links'
+    )
+    descendant = models.ForeignKey(
+        Employee,
+        on_delete=models.DO_NOTHING,
+        db_index=False,
+        related_name='ancestor_links'
+    )
+    depth = models.PositiveIntegerField()
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['ancestor', 'descendant'], name='unique_hierarchy_path'),
+        ]
+        indexes = [
+            models.Index(fields=['ancestor', 'depth', 'descendant']),
+            models.Index(fields=['descendant', 'depth', 'ancestor']),
+        ]
+    
+    def __str__(self):
+        return f"{self.ancestor_id} -> {self.descendant_id} ({self.depth})"
+
+
+class EmployeeAuditLog(models.Model):
+    ACTION_CHOICES = [
+        ('CREATE', 'Create'),
+        ('UPDATE', 'Update'),
+        ('STATUS_CHANGE', 'Status Change'),
+        ('DELETE', 'Delete'),
+        ('ARCHIVE', 'Archive'),
+        ('RESTORE', 'Restore'),
+    ]
+    
+    # No FK constraint so history outlives the employee row
+    employee = models.ForeignKey(
+        Employee,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='audit_logs'
+    )
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES)
+    changes = models.JSONField(default=dict)
+    changed_by = models.ForeignKey(
+        'auth.User',
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='employee_audit_logs'
+    )
+    changed_at = models.DateTimeField()
+    
+    class Meta:
+        ordering = ['-id']
+        indexes = [
+            models.Index(fields=['employee', '-id']),
+        ]
+    
+    def __str__(self):
+        return f"{self.action} employee={self.employee_id} at {self.changed_at}"
@@ -0,0 +1,39 @@
+import datetime
+import decimal
+import uuid
+
+from rest_framework.renderers import BaseRenderer
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+def _encode_default(value):
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    raise TypeError(f'Cannot serialize {type(value).__name__} to MessagePack')
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Compact binary renderer selected with ``Accept: application/msgpack``.
+    Only offered when the optional ``msgpack`` package is installed.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_encode_default, use_bin_type=True)
+
+
+def optional_renderer_classes():
+    """Binary renderers whose dependencies are installed"""
+    return [MessagePackRenderer] if msgpack is not None else []
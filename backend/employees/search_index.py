@@ -0,0 +1,252 @@
+"""
+In-process prefix index for employee autocomplete.
+
+Names, employee IDs and emails are lower-cased into a sorted list of
+(key, pk) pairs so a prefix lookup is a binary search followed by a
+short forward scan. Each worker builds the index when it starts
+(``start()``, called from wsgi.py) and a background thread rebuilds it
+every ``AUTOCOMPLETE_INDEX['MAX_AGE']`` seconds so it picks up writes
+made by other processes; lookups never wait for a rebuild. In between,
+the Employee signal handlers in ``signals.py`` apply this process's own
+committed writes; writes that land while a rebuild is reading the table
+are replayed onto its result.
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+
+from .models import Employee
+
+INDEX_FIELDS = ['id', 'employee_id', 'first_name', 'last_name', 'email', 'department']
+ENTRY_FIELDS = ('id', 'employee_id', 'full_name', 'department')
+
+logger = logging.getLogger(__name__)
+
+
+def get_index_setting(name, default):
+    return getattr(settings, 'AUTOCOMPLETE_INDEX', {}).get(name, default)
+
+
+def index_keys(row):
+    """Return the distinct lower-cased search keys for an employee row"""
+    # Names repeat across many employees, so share one string per name
+    first_name = sys.intern(row['first_name'].lower())
+    last_name = sys.intern(row['last_name'].lower())
+    return tuple({
+        row['employee_id'].lower(),
+        row['email'].lower(),
+        first_name,
+        last_name,
+        f"{first_name} {last_name}",
+    })
+
+
+class PrefixIndex:
+    """Sorted-array prefix index with incremental updates"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self._keys = []
+        self._entries = {}
+        self._entry_keys = {}
+        self._built_at = None
+        # One list per build in progress, collecting the writes applied
+        # while it reads the table so they can be replayed after its swap
+        self._builds = []
+        # pid of the process running the refresh thread; threads do not
+        # survive a fork, so a forked worker starts its own
+        self._refresher_pid = None
+
+    def build(self):
+        """Load every employee and replace the index contents"""
+        started = time.perf_counter()
+        pending = []
+        with self._lock:
+            self._builds.append(pending)
+        try:
+            keys, entries, entry_keys = [], {}, {}
+            for row in Employee.objects.values(*INDEX_FIELDS).iterator(chunk_size=5000):
+                pk = row['id']
+                entries[pk] = self._entry(row)
+                entry_keys[pk] = index_keys(row)
+                keys.extend((key, pk) for key in entry_keys[pk])
+            keys.sort()
+
+            with self._lock:
+                self._keys = keys
+                self._entries = entries
+                self._entry_keys = entry_keys
+                self._built_at = time.monotonic()
+                # Writes committed during the read went to the old arrays
+                # and may be missing from the rows it returned
+                for apply, args in pending:
+                    apply(*args)
+        finally:
+            with self._lock:
+                self._builds.remove(pending)
+        return time.perf_counter() - started
+
+    def start(self):
+        """Build the index now and keep it fresh from a background thread"""
+        try:
+            self.ensure_built()
+        except DatabaseError:
+            # e.g. a server started before migrate; the first lookup retries
+            logger.exception('Could not build the autocomplete index at startup')
+            return
+        self._ensure_refresher()
+
+    def ensure_built(self):
+        """Build the index if this process has never built it"""
+        if self._built_at is not None:
+            return
+        with self._build_lock:
+            # Another thread may have built it while we waited
+            if self._built_at is None:
+                self.build()
+
+    def _ensure_refresher(self):
+        max_age = get_index_setting('MAX_AGE', 300)
+        if not max_age or self._refresher_pid == os.getpid():
+            return
+        with self._build_lock:
+            if self._refresher_pid == os.getpid():
+                return
+            self._refresher_pid = os.getpid()
+            threading.Thread(
+                target=self._refresh_forever,
+                args=(max_age,),
+                name='employee-index-refresher',
+                daemon=True
+            ).start()
+
+    def _refresh_forever(self, max_age):
+        while True:
+            time.sleep(max_age)
+            try:
+                self.build()
+            except Exception:
+                logger.exception('Autocomplete index refresh failed')
+            finally:
+                # This thread's own connection; do not hold it while asleep
+                connection.close()
+
+    def upsert_row(self, row):
+        """Add or refresh the employee described by an INDEX_FIELDS dict"""
+        self._write(self._upsert_row, row)
+
+    def update_department(self, pks, department):
+        """Apply a bulk department change without rebuilding"""
+        self._write(self._update_department, list(pks), sys.intern(department))
+
+    def remove(self, pk):
+        self._write(self._remove, pk)
+
+    def remove_many(self, pks):
+        """Drop several employees with a single pass over the keys"""
+        self._write(self._remove_many, set(pks))
+
+    def _write(self, apply, *args):
+        with self._lock:
+            for pending in self._builds:
+                pending.append((apply, args))
+            # Nothing to keep in sync until the index is built
+            if self._built_at is not None:
+                apply(*args)
+
+    def _upsert_row(self, row):
+        pk = row['id']
+        self._remove_keys(pk)
+        self._entries[pk] = self._entry(row)
+        self._entry_keys[pk] = index_keys(row)
+        for key in self._entry_keys[pk]:
+            insort(self._keys, (key, pk))
+
+    def _update_department(self, pks, department):
+        for pk in pks:
+            entry = self._entries.get(pk)
+            if entry is not None:
+                self._entries[pk] = entry[:3] + (department,)
+
+    def _remove(self, pk):
+        self._remove_keys(pk)
+        self._entries.pop(pk, None)
+
+    def _remove_many(self, pks):
+        if pks.isdisjoint(self._entries):
+            return
+        self._keys = [item for item in self._keys if item[1] not in pks]
+        for pk in pks:
+            self._entries.pop(pk, None)
+            self._entry_keys.pop(pk, None)
+
+    def lookup(self, prefix, limit=10):
+        """Return up to ``limit`` distinct employees with a key starting with ``prefix``"""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        # Only a process that skipped start() builds here, once
+        self.ensure_built()
+        self._ensure_refresher()
+
+        results, seen = [], set()
+        with self._lock:
+            position = bisect_left(self._keys, (prefix,))
+            while position < len(self._keys) and len(results) < limit:
+                key, pk = self._keys[position]
+                if not key.startswith(prefix):
+                    break
+                if pk not in seen:
+                    seen.add(pk)
+                    results.append(dict(zip(ENTRY_FIELDS, self._entries[pk])))
+                position += 1
+        return results
+
+    def stats(self):
+        """Report entry counts and an approximate memory footprint in bytes"""
+        with self._lock:
+            # Interned name keys are shared, so count each string object once
+            key_strings = {id(key): key for key, _ in self._keys}
+            key_bytes = sys.getsizeof(self._keys) + sum(
+                sys.getsizeof(item) for item in self._keys
+            ) + sum(sys.getsizeof(key) for key in key_strings.values())
+            entry_bytes = sys.getsizeof(self._entries) + sum(
+                sys.getsizeof(entry) + sum(sys.getsizeof(value) for value in entry[:3])
+                for entry in self._entries.values()
+            )
+            entry_key_bytes = sys.getsizeof(self._entry_keys) + sum(
+                sys.getsizeof(keys) for keys in self._entry_keys.values()
+            )
+            return {
+                'employees': len(self._entries),
+                'keys': len(self._keys),
+                'key_bytes': key_bytes,
+                'entry_bytes': entry_bytes + entry_key_bytes,
+                'total_bytes': key_bytes + entry_bytes + entry_key_bytes,
+            }
+
+    def _remove_keys(self, pk):
+        for key in self._entry_keys.pop(pk, ()):
+            position = bisect_left(self._keys, (key, pk))
+            if position < len(self._keys) and self._keys[position] == (key, pk):
+                del self._keys[position]
+
+    @staticmethod
+    def _entry(row):
+        # Stored as a tuple in ENTRY_FIELDS order; department codes are shared
+        return (
+            row['id'],
+            row['employee_id'],
+            f"{row['first_name']} {row['last_name']}",
+            sys.intern(row['department']),
+        )
+
+
+employee_index = PrefixIndex()
@@ -1,10 +1,79 @@
 from rest_framework import serializers
-from .models import Employee
+from .models import ArchivedEmployee, Employee, EmployeeAuditLog
+from . import duplicates
 from datetime import date
+from decimal import Decimal, InvalidOperation
 
-class EmployeeSerializer(serializers.ModelSerializer):
+
+def parse_field_selection(request, available):
+    """
+    Resolve ``?fields=`` / ``?exclude=`` into the set of field names to
+    render, or None when the client did not ask for a sparse fieldset.
+    """
+    if request is None:
+        return None
+    fields = request.query_params.get('fields', '')
+    exclude = request.query_params.get('exclude', '')
+    if not fields and not exclude:
+        return None
+    
+    available = set(available)
+    requested = {name.strip() for name in fields.split(',') if name.strip()}
+    excluded = {name.strip() for name in exclude.split(',') if name.strip()}
+    # Report each unknown name under the parameter it came from
+    errors = {
+        param: f"Unknown field(s): {', '.join(sorted(names - available))}"
+        for param, names in (('fields', requested), ('exclude', excluded))
+        if names - available
+    }
+    if errors:
+        raise serializers.ValidationError(errors)
+    return (requested or available) - excluded
+
+
+class SparseFieldsetMixin:
+    """
+    Let clients trim the serialized output with ``?fields=a,b`` or
+    ``?exclude=c`` and report which model columns that output needs.
+    """
+    # Read-only properties and the model columns they are computed from
+    computed_field_columns = {
+        'full_name': ['first_name', 'last_name'],
+        'age': ['date_of_birth'],
+        'tenure': ['hire_date'],
+        'archived': [],
+    }
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = parse_field_selection(self.context.get('request'), self.fields.keys())
+        if selected is not None:
+            for name in set(self.fields) - selected:
+                self.fields.pop(name)
+    
+    @classmethod
+    def queryset_columns(cls, request):
+        """Return (columns, related) to pass to only() and select_related()"""
+        columns, related = {'id'}, set()
+        for name, field in cls(context={'request': request}).fields.items():
+            if name in cls.computed_field_columns:
+                columns.update(cls.computed_field_columns[name])
+            elif '.' in field.source:
+                relation = field.source.split('.')[0]
+                related.add(relation)
+                columns.add(field.source.replace('.', '__'))
+            else:
+                columns.add(field.source)
+        return sorted(columns), sorted(related)
+
+
+class EmployeeSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     full_name = serializers.ReadOnlyField()
-    age = serializers.ReadOnlyField()
+    age = serializers.SerializerMethodField()
+    tenure = serializers.SerializerMethodField()
+    archived = serializers.SerializerMethodField()
+    # The id column, which archived rows keep without the relation
+    manager = serializers.IntegerField(source='manager_id', read_only=True)
     created_by_username = serializers.CharField(
         source='created_by.username',
         read_only=True
@@ -31,8 +100,10 @@ class EmployeeSerializer(serializers.ModelSerializer):
             'department',
             'position',
             'hire_date',
+            'tenure',
             'salary',
             'employment_status',
+            'manager',
             'emergency_contact_name',
             'emergency_contact_phone',
             'emergency_contact_relationship',
@@ -41,9 +112,24 @@ class EmployeeSerializer(serializers.ModelSerializer):
             'updated_at',
             'created_by_username',
             'updated_by_username',
+            'archived',
         ]
         read_only_fields = ['created_at', 'updated_at', 'created_by', 'updated_by']
     
+    def get_age(self, obj):
+        """Prefer the database annotation added by with_age_and_tenure()"""
+        if hasattr(obj, 'age_years'):
+            return obj.age_years
+        return obj.age
+    
+    def get_tenure(self, obj):
+        if hasattr(obj, 'tenure_years'):
+            return obj.tenure_years
+        return obj.tenure
+    
+    def get_archived(self, obj):
+        return isinstance(obj, ArchivedEmployee)
+    
     def validate_date_of_birth(self, value):
         """Validate that employee is at least 18 years old"""
         today = date.today()
@@ -63,8 +149,8 @@ class EmployeeSerializer(serializers.ModelSerializer):
     def validate_salary(self, value):
         """Validate salary is positive"""
         try:
-            value = float(value)
-        except (TypeError, ValueError):
+            value = Decimal(str(value))
+        except (TypeError, ValueError, InvalidOperation):
             raise serializers.ValidationError("Salary must be a valid number.")
             
         if value <= 0:
@@ -90,9 +176,10 @@ class EmployeeSerializer(serializers.ModelSerializer):
         return value
 
 
-class EmployeeListSerializer(serializers.ModelSerializer):
+class EmployeeListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Lightweight serializer for list views"""
     full_name = serializers.ReadOnlyField()
+    archived = serializers.SerializerMethodField()
     
     class Meta:
         model = Employee
@@ -105,7 +192,11 @@ class EmployeeListSerializer(serializers.ModelSerializer):
             'position',
             'employment_status',
             'profile_picture',
+            'archived',
         ]
+    
+    def get_archived(self, obj):
+        return isinstance(obj, ArchivedEmployee)
 
 
 class EmployeeCreateUpdateSerializer(serializers.ModelSerializer):
@@ -127,12 +218,19 @@ class EmployeeCreateUpdateSerializer(serializers.ModelSerializer):
             'hire_date',
             'salary',
             'employment_status',
+            'manager',
             'emergency_contact_name',
             'emergency_contact_phone',
             'emergency_contact_relationship',
             'profile_picture',
         ]
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Existing employees that look like the one being created; filled in
+        # by validate() and returned alongside the new employee as a warning
+        self.possible_duplicates = []
+    
     def validate(self, data):
         """Cross-field validation"""
         if 'hire_date' in data and 'date_of_birth' in data:
@@ -140,4 +238,47 @@ class EmployeeCreateUpdateSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError({
                     'hire_date': 'Hire date cannot be before date of birth.'
                 })
+        if self.instance is None:
+            # A warning only: two people may share a name and birthday
+            self.possible_duplicates = duplicates.possible_duplicates(data)
         return data
+
+
+class OrgChartSerializer(serializers.ModelSerializer):
+    """Employees in a reporting line, with their distance from the queried employee"""
+    full_name = serializers.ReadOnlyField()
+    depth = serializers.IntegerField(read_only=True)
+    
+    # Model columns the output needs, for only()
+    columns = ['id', 'employee_id', 'first_name', 'last_name', 'department', 'position', 'manager']
+    
+    class Meta:
+        model = Employee
+        fields = [
+            'id',
+            'employee_id',
+            'full_name',
+            'department',
+            'position',
+            'manager',
+            'depth',
+        ]
+
+
+class EmployeeAuditLogSerializer(serializers.ModelSerializer):
+    """Read-only serializer for employee change history"""
+    changed_by_username = serializers.CharField(
+        source='changed_by.username',
+        read_only=True
+    )
+    
+    class Meta:
+        model = EmployeeAuditLog
+        fields = [
+            'id',
+            'action',
+            'changes',
+            'changed_by_username',
+            'changed_at',
+        ]
+        read_only_fields = fields
@@ -0,0 +1,60 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .cache import bump_data_generation
+from .models import Employee
+from .search_index import INDEX_FIELDS, employee_index
+from . import hierarchy
+
+
+@receiver(post_save, sender=Employee)
+def update_search_index(sender, instance, **kwargs):
+    """Keep the autocomplete index in step with saved employees"""
+    # Applied after commit, so a rolled-back save leaves no phantom entry;
+    # the values are captured now, as saved
+    row = {name: getattr(instance, name) for name in INDEX_FIELDS}
+    transaction.on_commit(lambda: employee_index.upsert_row(row))
+
+
+@receiver(post_delete, sender=Employee)
+def remove_from_search_index(sender, instance, **kwargs):
+    """Drop deleted employees from the autocomplete index"""
+    pk = instance.pk
+    transaction.on_commit(lambda: employee_index.remove(pk))
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+def invalidate_employee_caches(sender, **kwargs):
+    """Move cached employee aggregates on to a new data generation"""
+    # After commit: a report computed between the bump and the commit
+    # would otherwise be cached under the new generation without the write
+    transaction.on_commit(bump_data_generation)
+
+
+@receiver(pre_save, sender=Employee)
+def remember_manager(sender, instance, update_fields=None, **kwargs):
+    """Record the stored manager so post_save can tell whether it moved"""
+    if instance._state.adding or (update_fields is not None and 'manager' not in update_fields):
+        instance._stored_manager_id = instance.manager_id
+        return
+    instance._stored_manager_id = Employee.objects.filter(
+        pk=instance.pk
+    ).values_list('manager_id', flat=True).first()
+
+
+@receiver(post_save, sender=Employee)
+def update_hierarchy(sender, instance, created, **kwargs):
+    """Maintain the closure table on insert and manager change"""
+    if created:
+        hierarchy.add_node(instance.pk, instance.manager_id)
+    elif instance.manager_id != instance._stored_manager_id:
+        hierarchy.move_node(instance.pk, instance.manager_id)
+
+
+@receiver(pre_delete, sender=Employee)
+def detach_from_hierarchy(sender, instance, **kwargs):
+    """Hand the employee's reports to their manager before the row goes"""
+    # Set by the API's perform_destroy so the re-link is audited to the user
+    hierarchy.remove_nodes([instance.pk], getattr(instance, '_changed_by', None))
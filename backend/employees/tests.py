@@ -0,0 +1,862 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+
+import dj_database_url
+
+from django.conf import settings
+from django.contrib.admin.sites import site
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import OperationalError, connection, connections, transaction
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from employee_system import db_routing, warmup
+from employee_system.compression import CompressionMiddleware
+
+from . import analytics, archive, hierarchy, search_index
+from .admin import EmployeeAdmin
+from .filters import EmployeeOrderingFilter
+from .audit import AuditBuffer
+from .cache import GENERATION_KEY, bump_data_generation, data_generation
+from .models import ArchivedEmployee, Employee, EmployeeAuditLog, EmployeeHierarchy
+from .search_index import employee_index
+from .serializers import EmployeeCreateUpdateSerializer
+from .views import EmployeeViewSet
+
+
+def make_employee(number, user, **fields):
+    return Employee.objects.create(**{
+        'employee_id': f'EMP{number:04d}',
+        'first_name': 'Test',
+        'last_name': f'Person{number}',
+        'email': f'person{number}@example.com',
+        'phone': f'+1555000{number:04d}',
+        'date_of_birth': date(1990, 1, 1),
+        'gender': 'O',
+        'address': '1 Test Street',
+        'department': 'ENG',
+        'position': 'Engineer',
+        'hire_date': date(2020, 1, 1),
+        'salary': 50000,
+        'emergency_contact_name': 'Contact',
+        'emergency_contact_phone': '+15550009999',
+        'emergency_contact_relationship': 'Friend',
+        'created_by': user,
+        'updated_by': user,
+        **fields,
+    })
+
+
+class AuditSpoolTests(TransactionTestCase):
+    # Replays commit per batch, which is where deferred FK checks fire
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.spool_path = os.path.join(directory, 'audit_spool.jsonl')
+        overrides = override_settings(AUDIT_LOG={'ASYNC': False, 'SPOOL_PATH': self.spool_path})
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def entry(self, employee_pk):
+        return {
+            'employee_id': employee_pk,
+            'action': 'UPDATE',
+            'changes': {'position': ['A', 'B']},
+            'changed_by_id': None,
+            'changed_at': timezone.now().isoformat(),
+        }
+
+    def test_corrupt_line_is_quarantined_and_queue_still_drains(self):
+        with open(self.spool_path, 'w', encoding='utf-8') as spool:
+            spool.write(json.dumps(self.entry(1)) + '\n')
+            spool.write('{"employee_id": 2, "act')
+        buffer = AuditBuffer()
+        buffer._queue.put(self.entry(3))
+
+        buffer.flush()
+
+        self.assertEqual(
+            sorted(EmployeeAuditLog.objects.values_list('employee_id', flat=True)), [1, 3]
+        )
+        with open(self.spool_path, encoding='utf-8') as spool:
+            self.assertEqual(spool.read(), '')
+        with open(self.spool_path + '.rejected', encoding='utf-8') as rejected:
+            self.assertIn('"act', rejected.read())
+
+    def test_rejected_entry_does_not_block_the_rest(self):
+        bad = dict(self.entry(1), changed_by_id=999999)
+        with open(self.spool_path, 'w', encoding='utf-8') as spool:
+            spool.write(json.dumps(bad) + '\n')
+            spool.write(json.dumps(self.entry(2)) + '\n')
+
+        AuditBuffer().flush()
+
+        self.assertEqual(list(EmployeeAuditLog.objects.values_list('employee_id', flat=True)), [2])
+        with open(self.spool_path + '.rejected', encoding='utf-8') as rejected:
+            self.assertIn('999999', rejected.read())
+
+
+@override_settings(AUDIT_LOG={'ASYNC': False})
+class AuditChangeTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser('auditor')
+        self.employee = make_employee(1, self.user)
+        self.client.force_login(self.user)
+
+    def test_unchanged_admin_save_writes_no_entry(self):
+        url = reverse('admin:employees_employee_change', args=[self.employee.pk])
+        form = self.client.get(url).context['adminform'].form
+        data = {
+            name: form[name].value() for name in form.fields
+            if name != 'profile_picture' and form[name].value() is not None
+        }
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, data)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(EmployeeAuditLog.objects.exists())
+
+    def test_blocking_keys_are_not_audited(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            client.patch(f'/api/employees/{self.employee.pk}/', {'phone': '+15550001234'}, format='json')
+
+        self.assertEqual(
+            list(EmployeeAuditLog.objects.values_list('changes', flat=True)),
+            [{'phone': ['+15550000001', '+15550001234']}]
+        )
+
+
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('sparse', is_staff=True)
+        self.employee = make_employee(1, self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_fields_and_exclude(self):
+        response = self.client.get('/api/employees/', {'fields': 'employee_id,email'})
+        self.assertEqual(response.data['results'], [{'employee_id': 'EMP0001', 'email': 'person1@example.com'}])
+
+        response = self.client.get('/api/employees/', {'exclude': 'profile_picture,archived'})
+        self.assertEqual(
+            set(response.data['results'][0]),
+            {'id', 'employee_id', 'full_name', 'email', 'department', 'position', 'employment_status'}
+        )
+
+    def test_retrieve_fields(self):
+        response = self.client.get(f'/api/employees/{self.employee.pk}/', {'fields': 'full_name,age,tenure'})
+
+        self.assertEqual(set(response.data), {'full_name', 'age', 'tenure'})
+        self.assertEqual(response.data['full_name'], 'Test Person1')
+        self.assertEqual(response.data['age'], self.employee.age)
+
+    def test_search_advanced_fields(self):
+        response = self.client.get('/api/employees/search_advanced/', {'q': 'Person1', 'fields': 'employee_id'})
+
+        self.assertEqual(response.data['results'], [{'employee_id': 'EMP0001'}])
+
+    def test_unknown_field_is_reported_under_its_parameter(self):
+        response = self.client.get('/api/employees/', {'fields': 'employee_id,salary'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(response.data), ['fields'])
+
+        response = self.client.get(f'/api/employees/{self.employee.pk}/', {'exclude': 'bogus'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(response.data), ['exclude'])
+
+    def test_user_tables_are_joined_only_for_their_usernames(self):
+        url = f'/api/employees/{self.employee.pk}/'
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url, {'fields': 'employee_id'})
+        sql = ' '.join(query['sql'] for query in queries)
+        self.assertNotIn('auth_user', sql)
+        self.assertNotIn('"salary"', sql)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'fields': 'employee_id,updated_by_username'})
+        self.assertEqual(response.data['updated_by_username'], 'sparse')
+        self.assertEqual(len(queries), 1)
+        # updated_by only; created_by is not joined
+        self.assertEqual(queries[0]['sql'].count('JOIN "auth_user"'), 1)
+
+
+@override_settings(AUTOCOMPLETE_INDEX={'MAX_AGE': 0})
+class AutocompleteIndexTests(TransactionTestCase):
+    # Index writes wait for the commit, so the tests need real transactions
+    def setUp(self):
+        self.user = User.objects.create_user('indexer')
+        employee_index.build()
+        # Later tests rebuild from their own data
+        self.addCleanup(setattr, employee_index, '_built_at', None)
+
+    def test_write_is_indexed_after_commit(self):
+        with transaction.atomic():
+            make_employee(1, self.user, first_name='Ada')
+            self.assertEqual(employee_index.lookup('ada'), [])
+
+        self.assertEqual([row['employee_id'] for row in employee_index.lookup('ada')], ['EMP0001'])
+
+    def test_rolled_back_write_leaves_no_entry(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            make_employee(1, self.user, first_name='Ada')
+            raise RuntimeError
+
+        self.assertEqual(employee_index.lookup('ada'), [])
+
+    def test_writes_during_a_rebuild_survive_the_swap(self):
+        leaving = make_employee(1, self.user, first_name='Grace')
+        joining = {
+            'id': leaving.pk + 1, 'employee_id': 'EMP0002', 'first_name': 'Ada',
+            'last_name': 'Lovelace', 'email': 'ada@example.com', 'department': 'ENG',
+        }
+        real_index_keys = search_index.index_keys
+
+        def index_keys(row):
+            if row['id'] == leaving.pk:
+                # Commits landing after the rebuild has read the table
+                employee_index.upsert_row(joining)
+                employee_index.remove(leaving.pk)
+            return real_index_keys(row)
+
+        with mock.patch.object(search_index, 'index_keys', side_effect=index_keys):
+            employee_index.build()
+
+        self.assertEqual([row['employee_id'] for row in employee_index.lookup('ada')], ['EMP0002'])
+        self.assertEqual(employee_index.lookup('grace'), [])
+
+    def test_lookup_does_not_rebuild(self):
+        with mock.patch.object(employee_index, 'build') as build:
+            employee_index.lookup('ada')
+        build.assert_not_called()
+
+
+class AgeTenureFilterTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('filters', is_staff=True)
+        # Leap-day birthday and start date, and the days either side
+        make_employee(1, self.user, date_of_birth=date(2008, 2, 28), hire_date=date(2016, 2, 28))
+        make_employee(2, self.user, date_of_birth=date(2008, 2, 29), hire_date=date(2016, 2, 29))
+        make_employee(3, self.user, date_of_birth=date(2008, 3, 1), hire_date=date(2016, 3, 1))
+
+    def ids(self, queryset):
+        return sorted(queryset.values_list('employee_id', flat=True))
+
+    def get(self, **params):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        return client.get('/api/employees/', params)
+
+    def test_ranges_match_the_annotations(self):
+        for today in [date(2026, 2, 27), date(2026, 2, 28), date(2026, 3, 1),
+                      date(2028, 2, 28), date(2028, 2, 29), date(2028, 3, 1)]:
+            annotated = Employee.objects.with_age_and_tenure(today)
+            for years in range(9, 21):
+                with self.subTest(today=today, years=years):
+                    self.assertEqual(
+                        self.ids(Employee.objects.age_between(minimum=years, today=today)),
+                        self.ids(annotated.filter(age_years__gte=years))
+                    )
+                    self.assertEqual(
+                        self.ids(Employee.objects.age_between(maximum=years, today=today)),
+                        self.ids(annotated.filter(age_years__lte=years))
+                    )
+                    self.assertEqual(
+                        self.ids(Employee.objects.tenure_between(minimum=years, today=today)),
+                        self.ids(annotated.filter(tenure_years__gte=years))
+                    )
+                    self.assertEqual(
+                        self.ids(Employee.objects.tenure_between(maximum=years, today=today)),
+                        self.ids(annotated.filter(tenure_years__lte=years))
+                    )
+
+    def test_anniversary_counts_on_the_day(self):
+        today = date(2026, 3, 1)
+        ages = dict(Employee.objects.with_age_and_tenure(today).values_list('employee_id', 'age_years'))
+
+        self.assertEqual(ages, {'EMP0001': 18, 'EMP0002': 18, 'EMP0003': 18})
+        self.assertEqual(self.ids(Employee.objects.age_between(maximum=17, today=today)), [])
+        # In a common year a Feb 29 birthday is reached on Mar 1
+        self.assertEqual(
+            self.ids(Employee.objects.age_between(minimum=18, today=date(2026, 2, 28))), ['EMP0001']
+        )
+        self.assertEqual(
+            self.ids(Employee.objects.tenure_between(maximum=9, today=date(2026, 2, 28))),
+            ['EMP0002', 'EMP0003']
+        )
+
+    def test_api_filters(self):
+        response = self.get(age_min=0, tenure_max=150)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 3)
+
+    def test_out_of_range_and_fractional_years_are_rejected(self):
+        for params in [{'age_min': 3000}, {'tenure_max': 99999}, {'age_max': 2025},
+                       {'age_min': '1e10'}, {'age_min': '2.5'}, {'tenure_min': -1}]:
+            with self.subTest(params=params):
+                response = self.get(**params)
+
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(list(response.data), list(params))
+
+    def test_derived_orderings_use_the_date_columns(self):
+        ordering = EmployeeOrderingFilter()
+
+        self.assertEqual(ordering.translate('age'), '-date_of_birth')
+        self.assertEqual(ordering.translate('-age'), 'date_of_birth')
+        self.assertEqual(ordering.translate('-tenure'), 'hire_date')
+        self.assertEqual(ordering.translate('salary'), 'salary')
+
+        oldest_first = self.get(ordering='-age').data['results']
+        self.assertEqual([row['employee_id'] for row in oldest_first], ['EMP0001', 'EMP0002', 'EMP0003'])
+        shortest_first = self.get(ordering='tenure').data['results']
+        self.assertEqual([row['employee_id'] for row in shortest_first], ['EMP0003', 'EMP0002', 'EMP0001'])
+
+
+class CompressionMiddlewareTests(SimpleTestCase):
+    def process(self, response):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+        return CompressionMiddleware(lambda request: response).process_response(request, response)
+
+    def test_each_streamed_chunk_is_flushed(self):
+        response = self.process(StreamingHttpResponse(iter([b'{"first": 1}', b'{"second": 2}'])))
+
+        first = next(iter(response.streaming_content))
+        self.assertEqual(zlib.decompressobj(31).decompress(first), b'{"first": 1}')
+
+    def test_already_compressed_content_is_passed_through(self):
+        body = b'\x89PNG' + bytes(4096)
+        response = self.process(FileResponse(iter([body]), content_type='image/png'))
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(b''.join(response.streaming_content), body)
+
+    def test_text_is_compressed(self):
+        response = self.process(HttpResponse(b'x' * 4096, content_type='application/json'))
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+
+class CompensationReportTests(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('payroll')
+
+    def test_groups_and_totals(self):
+        today = date(2026, 10, 19)
+        make_employee(1, self.user, salary='50000.10', position='Engineer', hire_date=date(2016, 10, 19))
+        make_employee(2, self.user, salary='70000.25', position='Engineer', hire_date=date(2016, 10, 20))
+        make_employee(3, self.user, salary='90000.00', department='HR', position='Recruiter',
+                      hire_date=today - timedelta(days=30))
+
+        report = analytics.summarize_columns(analytics.load_columns(Employee.objects.all(), today=today))
+
+        self.assertEqual(report['overall']['total'], '210000.35')
+        self.assertEqual(report['overall']['median'], '70000.25')
+        self.assertEqual(report['groups']['department']['ENG']['headcount'], 2)
+        self.assertEqual(report['groups']['position']['Recruiter']['total'], '90000.00')
+        # Ten years complete on the anniversary itself, not the day after
+        self.assertEqual(
+            {band: group['headcount'] for band, group in report['groups']['tenure_band'].items()},
+            {'10-20y': 1, '5-10y': 1, '<1y': 1}
+        )
+        self.assertEqual(sum(report['groups']['department']['ENG']['histogram']), 2)
+
+    def test_empty_queryset(self):
+        report = analytics.compensation_report(Employee.objects.none())
+
+        self.assertIsNone(report['overall'])
+
+    def test_generation_moves_only_after_commit(self):
+        generation = data_generation()
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            make_employee(1, self.user)
+            raise RuntimeError
+        self.assertEqual(data_generation(), generation)
+
+        with transaction.atomic():
+            make_employee(1, self.user)
+            self.assertEqual(data_generation(), generation)
+        self.assertEqual(data_generation(), generation + 1)
+
+    def test_evicted_generation_does_not_restart(self):
+        generation = data_generation()
+        bump_data_generation()
+        cache.delete(GENERATION_KEY)
+
+        self.assertGreater(data_generation(), generation + 1)
+
+        reseeded = data_generation()
+        cache.delete(GENERATION_KEY)
+        bump_data_generation()
+        self.assertGreater(data_generation(), reseeded)
+
+
+@mock.patch.object(db_routing, 'healthy_replicas', return_value=['replica_1'])
+class ReplicaPinTests(SimpleTestCase):
+    def setUp(self):
+        self.view = db_routing.replica_reads(lambda request: HttpResponse())
+        # API writes in other tests pin the test client in the cache
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def write(self):
+        request = RequestFactory().post('/api/employees/')
+        return db_routing.ReplicaRoutingMiddleware(lambda request: HttpResponse(status=201))(request)
+
+    def test_write_pins_client_on_any_worker(self, healthy_replicas):
+        response = self.write()
+        # Another worker has no cache entry for this client
+        cache.clear()
+
+        request = RequestFactory().get('/api/employees/')
+        request.COOKIES[db_routing.PIN_COOKIE] = response.cookies[db_routing.PIN_COOKIE].value
+        self.assertIsNone(db_routing.replica_for(request, self.view))
+
+    def test_unpinned_read_uses_replica(self, healthy_replicas):
+        request = RequestFactory().get('/api/employees/')
+        self.assertEqual(db_routing.replica_for(request, self.view), 'replica_1')
+
+    def test_unsigned_pin_is_ignored(self, healthy_replicas):
+        request = RequestFactory().get('/api/employees/')
+        request.COOKIES[db_routing.PIN_COOKIE] = '1'
+        self.assertEqual(db_routing.replica_for(request, self.view), 'replica_1')
+
+
+@override_settings(AUDIT_LOG={'ASYNC': False})
+class ReplicaRoutingTests(TransactionTestCase):
+    """Two SQLite databases: the test primary and a replica file synced from it"""
+
+    @classmethod
+    def setUpClass(cls):
+        # The replica exists only for this class; with it configured for the
+        # whole run every other test's reads would be routed to it
+        cls.replica_path = os.path.join(tempfile.mkdtemp(), 'replica.sqlite3')
+        replica = dj_database_url.parse(f'sqlite:///{cls.replica_path}')
+        connections.configure_settings({'default': settings.DATABASES['default'], 'replica_1': replica})
+        # connections reads the same dict, so the alias exists for both
+        settings.DATABASES['replica_1'] = replica
+        cls.databases = {'default', 'replica_1'}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections['replica_1'].close()
+        del connections['replica_1']
+        del settings.DATABASES['replica_1']
+
+    def setUp(self):
+        # Start every test from an empty replica file
+        connections['replica_1'].close()
+        if os.path.exists(self.replica_path):
+            os.remove(self.replica_path)
+        cache.clear()
+        self.addCleanup(db_routing._unhealthy_until.clear)
+        self.user = User.objects.create_user('replica-reader', email='old@example.com', is_staff=True)
+        self.employee = make_employee(1, self.user)
+
+    def sync(self):
+        connections['replica_1'].close()
+        call_command('sync_sqlite_replica', stdout=StringIO())
+
+    def client_for(self, user=None):
+        client = APIClient()
+        client.force_authenticate(user or self.user)
+        return client
+
+    def test_reads_are_served_by_the_replica(self):
+        self.sync()
+        make_employee(2, self.user)
+
+        response = self.client_for().get('/api/employees/')
+
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(Employee.objects.count(), 2)
+
+    def test_write_pins_the_client_to_the_primary(self):
+        self.sync()
+        client = self.client_for()
+
+        response = client.patch(f'/api/employees/{self.employee.pk}/', {'position': 'Lead'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(client.get(f'/api/employees/{self.employee.pk}/').data['position'], 'Lead')
+        # Another client, with neither the cookie nor the cache pin
+        cache.clear()
+        self.assertEqual(
+            self.client_for().get(f'/api/employees/{self.employee.pk}/').data['position'], 'Engineer'
+        )
+
+    def test_replica_error_is_retried_on_the_primary(self):
+        # Never synced: the replica has no tables
+        with self.assertLogs('employee_system.db_routing', 'WARNING'):
+            response = self.client_for().get('/api/employees/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(db_routing.healthy_replicas(), [])
+
+    def test_profile_is_read_from_the_replica(self):
+        self.sync()
+        User.objects.filter(pk=self.user.pk).update(email='new@example.com')
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+        response = client.get('/api/auth/profile/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['email'], 'old@example.com')
+
+
+@override_settings(AUDIT_LOG={'ASYNC': False})
+class BatchApiTests(TransactionTestCase):
+    # Parallel sub-requests run on their own connections
+    def setUp(self):
+        self.admin = User.objects.create_user('batch-admin', is_staff=True)
+        self.employee = make_employee(1, self.admin)
+        self.addCleanup(cache.clear)
+
+    def post(self, requests, user=None, **options):
+        client = APIClient()
+        client.force_authenticate(user or self.admin)
+        return client.post('/api/batch/', {'requests': requests, **options}, format='json')
+
+    def test_path_outside_the_allow_list_is_rejected(self):
+        response = self.post([{'path': '/admin/'}])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('path', response.data['requests'][0])
+
+    @override_settings(BATCH_API={'MAX_REQUESTS': 2})
+    def test_request_limit(self):
+        response = self.post([{'path': '/api/employees/'}] * 3)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('At most 2', str(response.data['requests']))
+
+    def test_failed_sub_requests_do_not_fail_the_batch(self):
+        with mock.patch.object(EmployeeViewSet, 'statistics', side_effect=RuntimeError), \
+                self.assertLogs('employee_system.batch', 'ERROR'):
+            response = self.post([
+                {'id': 'missing', 'path': '/api/employees/999999/'},
+                {'id': 'broken', 'path': '/api/employees/statistics/'},
+                {'id': 'list', 'path': '/api/employees/', 'params': {'department': 'ENG'}},
+            ])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(entry['id'], entry['status']) for entry in response.data['responses']],
+            [('missing', 404), ('broken', 500), ('list', 200)]
+        )
+        self.assertEqual(response.data['responses'][2]['body']['count'], 1)
+
+    def test_each_sub_request_checks_its_own_permissions(self):
+        user = User.objects.create_user('batch-user')
+
+        response = self.post([{'path': '/api/employees/'}, {'path': '/api/auth/profile/'}], user=user)
+
+        self.assertEqual([entry['status'] for entry in response.data['responses']], [403, 200])
+
+    def test_only_read_only_batches_run_in_parallel(self):
+        reads = [{'path': '/api/employees/'}, {'path': f'/api/employees/{self.employee.pk}/'}]
+        write = {'method': 'PATCH', 'path': f'/api/employees/{self.employee.pk}/', 'body': {'position': 'Lead'}}
+
+        with mock.patch('employee_system.batch.ThreadPoolExecutor', wraps=ThreadPoolExecutor) as pool:
+            response = self.post(reads, parallel=True)
+            self.assertEqual(pool.call_count, 1)
+            self.assertEqual([entry['status'] for entry in response.data['responses']], [200, 200])
+
+            response = self.post([*reads, write], parallel=True)
+            self.assertEqual(pool.call_count, 1)
+            self.assertEqual([entry['status'] for entry in response.data['responses']], [200, 200, 200])
+
+    def test_only_batches_that_write_pin_the_client(self):
+        response = self.post([{'path': '/api/employees/'}])
+        self.assertNotIn(db_routing.PIN_COOKIE, response.cookies)
+
+        response = self.post([
+            {'method': 'PATCH', 'path': f'/api/employees/{self.employee.pk}/', 'body': {'position': 'Lead'}},
+        ])
+        self.assertIn(db_routing.PIN_COOKIE, response.cookies)
+        self.assertEqual(Employee.objects.get(pk=self.employee.pk).position, 'Lead')
+
+
+class AdminSearchTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user('admin-search')
+        make_employee(1, user, first_name='Ada', last_name='Lovelace')
+        make_employee(2, user, first_name='Grace', last_name='Hopper')
+
+    def search(self, term):
+        queryset, _ = EmployeeAdmin(Employee, site).get_search_results(None, Employee.objects.all(), term)
+        return sorted(queryset.values_list('employee_id', flat=True))
+
+    def test_name_prefix_ignores_case(self):
+        self.assertEqual(self.search('love'), ['EMP0001'])
+        self.assertEqual(self.search('GRA'), ['EMP0002'])
+        self.assertEqual(self.search('ada LOVE'), ['EMP0001'])
+        self.assertEqual(self.search('ada hop'), [])
+
+    def test_employee_id_and_email(self):
+        self.assertEqual(self.search('emp0002'), ['EMP0002'])
+        self.assertEqual(self.search('person1@example.com'), ['EMP0001'])
+
+
+@override_settings(AUDIT_LOG={'ASYNC': False})
+class HierarchyTests(TransactionTestCase):
+    # Closure rows and moves are checked with real commits
+    def setUp(self):
+        self.user = User.objects.create_user('hierarchy', is_staff=True)
+        # ceo <- cto <- dev, ceo <- cfo
+        self.ceo = make_employee(1, self.user)
+        self.cto = make_employee(2, self.user, manager=self.ceo)
+        self.cfo = make_employee(3, self.user, manager=self.ceo)
+        self.dev = make_employee(4, self.user, manager=self.cto)
+
+    def paths(self):
+        return set(EmployeeHierarchy.objects.values_list('ancestor_id', 'descendant_id', 'depth'))
+
+    def assertConsistent(self):
+        """The maintained rows equal a rebuild from the manager column"""
+        maintained = self.paths()
+        hierarchy.rebuild_hierarchy()
+        self.assertEqual(maintained, self.paths())
+
+    def test_insert_adds_path_to_every_ancestor(self):
+        self.assertEqual(
+            {(ancestor, depth) for ancestor, descendant, depth in self.paths() if descendant == self.dev.pk},
+            {(self.dev.pk, 0), (self.cto.pk, 1), (self.ceo.pk, 2)}
+        )
+        self.assertConsistent()
+
+    def test_move_relinks_the_subtree(self):
+        self.cto.manager = self.cfo
+        self.cto.save()
+
+        self.assertIn((self.cfo.pk, self.dev.pk, 2), self.paths())
+        self.assertIn((self.ceo.pk, self.dev.pk, 3), self.paths())
+        self.assertConsistent()
+
+    def test_remove_nodes_hands_reports_to_the_manager(self):
+        hierarchy.remove_nodes([self.cto.pk], self.user)
+        Employee.objects.filter(pk=self.cto.pk).delete()
+
+        self.assertEqual(Employee.objects.get(pk=self.dev.pk).manager_id, self.ceo.pk)
+        self.assertNotIn(self.cto.pk, {descendant for _, descendant, _ in self.paths()})
+        self.assertConsistent()
+
+    def test_remove_nodes_statements_do_not_grow_with_reports(self):
+        def statements():
+            with CaptureQueriesContext(connection) as queries, transaction.atomic():
+                hierarchy.remove_nodes([self.cto.pk], self.user)
+                transaction.set_rollback(True)
+            return len(queries)
+
+        with_one_report = statements()
+        for number in range(5, 10):
+            make_employee(number, self.user, manager=self.cto)
+
+        self.assertEqual(statements(), with_one_report)
+
+    def test_api_delete_audits_the_relink_to_the_user(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.delete(f'/api/employees/{self.cto.pk}/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Employee.objects.get(pk=self.dev.pk).manager_id, self.ceo.pk)
+        entry = EmployeeAuditLog.objects.get(employee_id=self.dev.pk)
+        self.assertEqual(entry.changes, {'manager': [str(self.cto.pk), str(self.ceo.pk)]})
+        self.assertEqual(entry.changed_by, self.user)
+        self.assertConsistent()
+
+    def test_manager_change_checks_for_cycles_once(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.patch(f'/api/employees/{self.cto.pk}/', {'manager': self.dev.pk}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('manager', response.data)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.patch(f'/api/employees/{self.cto.pk}/', {'manager': self.cfo.pk}, format='json')
+        self.assertEqual(response.status_code, 200)
+        closure_reads = [
+            query for query in queries
+            if query['sql'].startswith('SELECT') and EmployeeHierarchy._meta.db_table in query['sql']
+        ]
+        self.assertEqual(len(closure_reads), 1)
+        self.assertConsistent()
+
+    def test_archive_and_restore(self):
+        archive.archive_batch(Employee.objects.filter(pk=self.cto.pk), user=self.user)
+
+        self.assertEqual(Employee.objects.get(pk=self.dev.pk).manager_id, self.ceo.pk)
+        self.assertConsistent()
+
+        restored = archive.restore_employee(ArchivedEmployee.objects.get(pk=self.cto.pk), self.user)
+
+        self.assertEqual(restored.manager_id, self.ceo.pk)
+        self.assertIn((self.ceo.pk, self.cto.pk, 1), self.paths())
+        self.assertConsistent()
+
+    def test_failed_relink_rolls_back_the_update(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        with mock.patch.object(hierarchy, 'move_node', side_effect=RuntimeError), \
+                self.assertRaises(RuntimeError):
+            client.patch(f'/api/employees/{self.cto.pk}/', {'manager': self.cfo.pk}, format='json')
+
+        self.assertEqual(Employee.objects.get(pk=self.cto.pk).manager_id, self.ceo.pk)
+        self.assertConsistent()
+
+    def test_archived_employee_retrieve(self):
+        archive.archive_batch(Employee.objects.filter(pk=self.dev.pk), user=self.user)
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.get(f'/api/employees/{self.dev.pk}/?include_archived=1', HTTP_HOST='localhost')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['manager'], self.cto.pk)
+        self.assertTrue(response.data['archived'])
+
+
+class WarmUpTests(TestCase):
+    def test_unreachable_database_is_logged_not_raised(self):
+        with mock.patch.object(connections['default'], 'ensure_connection',
+                               side_effect=OperationalError('unreachable')), \
+                self.assertLogs('employee_system.warmup', 'ERROR') as logs:
+            timings = warmup.warm_up()
+
+        self.assertEqual(set(timings), {'urls', 'database', 'authentication', 'employee_views'})
+        self.assertTrue(any('database' in line for line in logs.output))
+
+    def test_unreachable_replica_is_marked_unhealthy(self):
+        replica = mock.Mock(**{'ensure_connection.side_effect': OperationalError('unreachable')})
+        aliases = {'default': connections['default'], 'replica_1': replica}
+
+        with mock.patch.object(warmup, 'connections', aliases), \
+                mock.patch.object(db_routing, 'mark_unhealthy') as mark_unhealthy, \
+                self.assertLogs('employee_system.warmup', 'WARNING'):
+            warmup.warm_databases()
+
+        mark_unhealthy.assert_called_once_with('replica_1')
+
+
+class ApiOnlyTests(SimpleTestCase):
+    def test_api_only_worker_has_no_admin(self):
+        script = (
+            'import django\n'
+            'django.setup()\n'
+            'from django.apps import apps\n'
+            'from django.urls import Resolver404, resolve\n'
+            'assert not apps.is_installed("django.contrib.admin")\n'
+            'resolve("/api/employees/")\n'
+            'try:\n'
+            '    resolve("/admin/")\n'
+            'except Resolver404:\n'
+            '    pass\n'
+            'else:\n'
+            '    raise SystemExit("/admin/ is registered")\n'
+        )
+        environ = dict(os.environ, API_ONLY='true', DJANGO_SETTINGS_MODULE='employee_system.settings')
+
+        result = subprocess.run(
+            [sys.executable, '-c', script], cwd=settings.BASE_DIR, env=environ,
+            capture_output=True, text=True
+        )
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+@override_settings(AUDIT_LOG={'ASYNC': False})
+class ArchiveTests(TransactionTestCase):
+    # Each archive batch is its own transaction
+    def setUp(self):
+        self.user = User.objects.create_user('archivist', is_staff=True)
+        self.now = timezone.now()
+
+    def terminated(self, number, days_ago):
+        employee = make_employee(number, self.user, employment_status='TERMINATED')
+        Employee.objects.filter(pk=employee.pk).update(updated_at=self.now - timedelta(days=days_ago))
+        return employee
+
+    def test_candidates_respect_retention(self):
+        old = self.terminated(1, days_ago=400)
+        self.terminated(2, days_ago=10)
+        active = make_employee(3, self.user)
+        Employee.objects.filter(pk=active.pk).update(updated_at=self.now - timedelta(days=400))
+
+        self.assertEqual(list(archive.archive_candidates(now=self.now)), [old])
+        self.assertEqual(archive.archive_candidates(retention_days=5, now=self.now).count(), 2)
+
+    def test_interrupted_run_resumes_where_it_stopped(self):
+        pks = [self.terminated(number, days_ago=400).pk for number in range(1, 6)]
+        remove_nodes = hierarchy.remove_nodes
+        calls = []
+
+        def fail_second_batch(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 2:
+                raise RuntimeError
+            return remove_nodes(*args, **kwargs)
+
+        with mock.patch.object(hierarchy, 'remove_nodes', side_effect=fail_second_batch), \
+                self.assertRaises(RuntimeError):
+            list(archive.archive_in_batches(archive.archive_candidates(now=self.now), batch_size=2))
+
+        # The first batch committed; the failed one rolled back whole
+        self.assertEqual(sorted(ArchivedEmployee.objects.values_list('pk', flat=True)), pks[:2])
+        self.assertEqual(sorted(Employee.objects.values_list('pk', flat=True)), pks[2:])
+
+        batches = list(archive.archive_in_batches(archive.archive_candidates(now=self.now), batch_size=2))
+
+        self.assertEqual(batches, [pks[2:4], pks[4:]])
+        self.assertFalse(Employee.objects.exists())
+        self.assertFalse(EmployeeHierarchy.objects.exists())
+        self.assertEqual(
+            EmployeeAuditLog.objects.filter(action='ARCHIVE').count(), 5
+        )
+
+    def test_restore_conflict_is_409(self):
+        employee = self.terminated(1, days_ago=400)
+        archive.archive_batch(Employee.objects.filter(pk=employee.pk), user=self.user)
+        make_employee(2, self.user, employee_id=employee.employee_id)
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.post(f'/api/employees/{employee.pk}/restore/')
+
+        self.assertEqual(response.status_code, 409)
+        self.assertIn(employee.employee_id, response.data['error'])
+        self.assertTrue(ArchivedEmployee.objects.filter(pk=employee.pk).exists())
+
+
+class DuplicateWarningTests(TestCase):
+    def test_each_serializer_has_its_own_warning_list(self):
+        first, second = EmployeeCreateUpdateSerializer(), EmployeeCreateUpdateSerializer()
+        first.possible_duplicates.append({'id': 1})
+
+        self.assertEqual(second.possible_duplicates, [])
@@ -1,16 +1,26 @@
-from rest_framework import viewsets, status, filters
+from rest_framework import viewsets, status, filters, serializers
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
-from .models import Employee
+from rest_framework.settings import api_settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import BooleanField, Count, Q, Value
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from .models import ArchivedEmployee, Employee
 from .serializers import (
     EmployeeSerializer,
     EmployeeListSerializer,
-    EmployeeCreateUpdateSerializer
+    EmployeeCreateUpdateSerializer,
+    EmployeeAuditLogSerializer,
+    OrgChartSerializer
 )
 from .permissions import IsAdminUser
+from .filters import EmployeeFilter, EmployeeFilterBackend, EmployeeOrderingFilter
+from .renderers import optional_renderer_classes
+from . import archive, audit, hierarchy
+from .search_index import employee_index
 
 class EmployeeViewSet(viewsets.ModelViewSet):
     """
@@ -25,37 +35,168 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     """
     queryset = Employee.objects.all()
     permission_classes = [IsAuthenticated, IsAdminUser]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['department', 'employment_status', 'gender']
+    # Safe-method requests may be served from a read replica
+    replica_reads = True
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + optional_renderer_classes()
+    filter_backends = [EmployeeFilterBackend, filters.SearchFilter, EmployeeOrderingFilter]
+    filterset_class = EmployeeFilter
     search_fields = ['employee_id', 'first_name', 'last_name', 'email', 'position']
-    ordering_fields = ['employee_id', 'first_name', 'last_name', 'hire_date', 'salary']
+    ordering_fields = [
+        'employee_id',
+        'first_name',
+        'last_name',
+        'date_of_birth',
+        'hire_date',
+        'salary',
+        'age',
+        'tenure',
+    ]
     ordering = ['-created_at']
+    # Actions whose SQL column list follows ?fields= / ?exclude=
+    sparse_actions = ['list', 'retrieve', 'search_advanced']
+    # Detail actions that also find archived employees with ?include_archived=
+    archived_detail_actions = ['retrieve', 'history']
+    
+    def get_queryset(self):
+        return self.restrict_columns(super().get_queryset())
+    
+    def get_archived_queryset(self):
+        return self.restrict_columns(ArchivedEmployee.objects.all())
+    
+    def restrict_columns(self, queryset):
+        """Load only the columns and relations the response will render"""
+        serializer_class = self.get_serializer_class()
+        if serializer_class is EmployeeSerializer:
+            # age and tenure are rendered from database annotations
+            queryset = queryset.with_age_and_tenure()
+        if self.action in self.sparse_actions:
+            columns, related = serializer_class.queryset_columns(self.request)
+            if related:
+                queryset = queryset.select_related(*related)
+            queryset = queryset.only(*columns)
+        return queryset
+    
+    def include_archived(self):
+        value = self.request.query_params.get('include_archived', '')
+        return value.lower() in ('1', 'true', 'yes')
+    
+    def get_object(self):
+        try:
+            return super().get_object()
+        except Http404:
+            if self.action not in self.archived_detail_actions or not self.include_archived():
+                raise
+        employee = get_object_or_404(self.get_archived_queryset(), pk=self.kwargs['pk'])
+        self.check_object_permissions(self.request, employee)
+        return employee
+    
+    def list(self, request, *args, **kwargs):
+        if not self.include_archived():
+            return super().list(request, *args, **kwargs)
+        return self.list_with_archived(
+            self.filter_queryset(self.get_queryset()),
+            self.filter_queryset(self.get_archived_queryset())
+        )
+    
+    def list_with_archived(self, queryset, archived):
+        """
+        Paginate live and archived employees as a single list. The UNION
+        only carries primary keys and sort columns; the rows of the page
+        are then loaded from their own table by primary key.
+        """
+        ordering = EmployeeOrderingFilter().get_ordering(self.request, queryset, self)
+        ordering = [*ordering, '-id'] if 'id' not in ordering else list(ordering)
+        columns = list(dict.fromkeys(['id', *(term.lstrip('-') for term in ordering)]))
+        
+        def sort_keys(rows, is_archived):
+            return rows.order_by().annotate(
+                is_archived=Value(is_archived, output_field=BooleanField())
+            ).values_list(*columns, 'is_archived')
+        
+        combined = sort_keys(queryset, False).union(sort_keys(archived, True), all=True)
+        combined = combined.order_by(*ordering)
+        
+        page = self.paginate_queryset(combined)
+        keys = page if page is not None else list(combined)
+        live = queryset.in_bulk([key[0] for key in keys if not key[-1]])
+        cold = archived.in_bulk([key[0] for key in keys if key[-1]])
+        # Skip rows moved between the two tables since the UNION ran
+        records = [
+            record for record in (
+                (cold if key[-1] else live).get(key[0]) for key in keys
+            )
+            if record is not None
+        ]
+        
+        serializer = self.get_serializer(records, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
     
     def get_serializer_class(self):
         """Return appropriate serializer based on action"""
-        if self.action == 'list':
+        if self.action in ['list', 'search_advanced']:
             return EmployeeListSerializer
         elif self.action in ['create', 'update', 'partial_update']:
             return EmployeeCreateUpdateSerializer
+        elif self.action in ['subtree', 'chain']:
+            return OrgChartSerializer
         return EmployeeSerializer
     
+    def create(self, request, *args, **kwargs):
+        """Create an employee and warn about existing look-alikes"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        data = dict(serializer.data)
+        if serializer.possible_duplicates:
+            data['possible_duplicates'] = serializer.possible_duplicates
+        headers = self.get_success_headers(serializer.data)
+        return Response(data, status=status.HTTP_201_CREATED, headers=headers)
+    
     def perform_create(self, serializer):
         """Set the created_by field to current user"""
         try:
-            serializer.save(created_by=self.request.user)
+            # The insert and its closure-table rows commit together
+            with transaction.atomic():
+                employee = serializer.save(
+                    created_by=self.request.user,
+                    updated_by=self.request.user
+                )
+        except ValidationError as e:
+            raise serializers.ValidationError(e.message_dict)
         except Exception as e:
             print(f"Error creating employee: {str(e)}")
             raise
+        audit.record_change(employee, {}, self.request.user, action='CREATE')
     
     def perform_update(self, serializer):
         """Set the updated_by field to current user"""
-        serializer.save(updated_by=self.request.user)
+        before = audit.snapshot(serializer.instance)
+        # The save and the reporting-line re-link in its post_save
+        # handler commit together or not at all
+        try:
+            with transaction.atomic():
+                employee = serializer.save(updated_by=self.request.user)
+        except ValidationError as e:
+            # Model.clean() owns the checks that need the database, such
+            # as reporting-line cycles
+            raise serializers.ValidationError(e.message_dict)
+        audit.record_change(employee, before, self.request.user)
+    
+    def perform_destroy(self, instance):
+        # Read by the pre_delete handler that re-links the reports
+        instance._changed_by = self.request.user
+        instance.delete()
     
     def destroy(self, request, *args, **kwargs):
         """Custom delete with proper response"""
         instance = self.get_object()
         employee_id = instance.employee_id
+        employee_pk = instance.pk
+        before = audit.snapshot(instance)
         self.perform_destroy(instance)
+        audit.record_deletion(employee_pk, before, request.user)
         return Response(
             {'message': f'Employee {employee_id} has been successfully deleted.'},
             status=status.HTTP_200_OK
@@ -80,6 +221,43 @@ class EmployeeViewSet(viewsets.ModelViewSet):
             'department_distribution': department_counts,
         })
     
+    @action(detail=False, methods=['get'])
+    def compensation(self, request):
+        """
+        Salary percentiles, histograms and exact totals per department,
+        position and tenure band. Accepts the same filters as the list.
+        """
+        # Imported on first use: NumPy adds ~50 ms to every worker start
+        from . import analytics
+        
+        group_by = [
+            name.strip() for name in request.query_params.get('group_by', '').split(',')
+            if name.strip()
+        ] or analytics.GROUP_DIMENSIONS
+        unknown = set(group_by) - set(analytics.GROUP_DIMENSIONS)
+        if unknown:
+            return Response(
+                {'error': f"Invalid group_by: {', '.join(sorted(unknown))}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            bins = min(max(int(request.query_params.get('bins', 10)), 1), 100)
+        except ValueError:
+            return Response(
+                {'error': 'bins must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        report = analytics.cached_compensation_report(
+            queryset,
+            cache_key_parts=request.query_params.dict(),
+            group_by=group_by,
+            bins=bins
+        )
+        return Response(report)
+    
     @action(detail=True, methods=['patch'])
     def change_status(self, request, pk=None):
         """Change employment status of an employee"""
@@ -98,9 +276,121 @@ class EmployeeViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        before = audit.snapshot(employee)
         employee.employment_status = new_status
         employee.updated_by = request.user
         employee.save()
+        audit.record_change(employee, before, request.user, action='STATUS_CHANGE')
+        
+        serializer = self.get_serializer(employee)
+        return Response(serializer.data)
+    
+    @action(detail=True, methods=['get'])
+    def history(self, request, pk=None):
+        """Get the change history of an employee, newest first"""
+        employee = self.get_object()
+        
+        try:
+            before = request.query_params.get('before')
+            before = int(before) if before else None
+            limit = min(int(request.query_params.get('limit', 50)), 200)
+        except ValueError:
+            return Response(
+                {'error': 'before and limit must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        entries, next_cursor = audit.employee_history(
+            employee.pk, before=before, limit=max(limit, 1)
+        )
+        return Response({
+            'next_cursor': next_cursor,
+            'results': EmployeeAuditLogSerializer(entries, many=True).data,
+        })
+    
+    @action(detail=True, methods=['get'])
+    def subtree(self, request, pk=None):
+        """
+        Everyone reporting to an employee at any depth, nearest levels
+        first (``?max_depth=1`` for direct reports). List filters apply.
+        """
+        employee = self.get_object()
+        try:
+            max_depth = request.query_params.get('max_depth')
+            max_depth = int(max_depth) if max_depth else None
+        except ValueError:
+            return Response(
+                {'error': 'max_depth must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        queryset = hierarchy.subtree(
+            self.filter_queryset(self.get_queryset()), employee.pk, max_depth
+        ).only(*OrgChartSerializer.columns)
+        if 'ordering' not in request.query_params:
+            queryset = queryset.order_by('depth', 'last_name', 'first_name', 'id')
+        
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+    
+    @action(detail=True, methods=['get'])
+    def chain(self, request, pk=None):
+        """Chain of command above an employee, direct manager first"""
+        employee = self.get_object()
+        queryset = hierarchy.chain_of_command(
+            self.get_queryset(), employee.pk
+        ).only(*OrgChartSerializer.columns)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+    
+    @action(detail=True, methods=['get'])
+    def subtree_headcount(self, request, pk=None):
+        """Headcount under an employee by department. List filters apply."""
+        employee = self.get_object()
+        queryset = hierarchy.subtree(self.filter_queryset(self.get_queryset()), employee.pk)
+        counts = queryset.order_by().values('department').annotate(headcount=Count('id'))
+        
+        department_names = dict(Employee.DEPARTMENT_CHOICES)
+        distribution = {
+            department_names.get(row['department'], row['department']): row['headcount']
+            for row in counts.order_by('department')
+        }
+        return Response({
+            'employee_id': employee.employee_id,
+            'total_reports': sum(distribution.values()),
+            'department_distribution': distribution,
+        })
+    
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """Top matches for a name, employee ID or email prefix"""
+        query = request.query_params.get('q', '')
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 50)
+        except ValueError:
+            return Response(
+                {'error': 'limit must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return Response(employee_index.lookup(query, limit=limit))
+    
+    @action(detail=True, methods=['post'])
+    def restore(self, request, pk=None):
+        """Move an archived employee back into the live table"""
+        archived = get_object_or_404(ArchivedEmployee, pk=pk)
+        try:
+            employee = archive.restore_employee(archived, request.user)
+        except ValidationError as e:
+            return Response(
+                {'error': ' '.join(e.messages)},
+                status=status.HTTP_409_CONFLICT
+            )
         
         serializer = self.get_serializer(employee)
         return Response(serializer.data)
@@ -112,10 +402,10 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         department = request.query_params.get('department', '')
         status_filter = request.query_params.get('status', '')
         
-        queryset = self.queryset
+        conditions = Q()
         
         if query:
-            queryset = queryset.filter(
+            conditions &= (
                 Q(employee_id__icontains=query) |
                 Q(first_name__icontains=query) |
                 Q(last_name__icontains=query) |
@@ -124,15 +414,22 @@ class EmployeeViewSet(viewsets.ModelViewSet):
             )
         
         if department:
-            queryset = queryset.filter(department=department)
+            conditions &= Q(department=department)
         
         if status_filter:
-            queryset = queryset.filter(employment_status=status_filter)
+            conditions &= Q(employment_status=status_filter)
+        
+        queryset = self.get_queryset().filter(conditions)
+        if self.include_archived():
+            return self.list_with_archived(
+                queryset,
+                self.get_archived_queryset().filter(conditions)
+            )
         
         page = self.paginate_queryset(queryset)
         if page is not None:
-            serializer = EmployeeListSerializer(page, many=True)
+            serializer = self.get_serializer(page, many=True)
             return self.get_paginated_response(serializer.data)
         
-        serializer = EmployeeListSerializer(queryset, many=True)
+        serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
@@ -81,6 +81,12 @@ const EmployeeForm = ({ mode = 'create' }) => {
 
     if (result.success) {
       toast.success(`Employee ${mode === 'create' ? 'created' : 'updated'} successfully`);
+      const duplicates = result.data?.possible_duplicates || [];
+      if (duplicates.length) {
+        toast.warning(
+          `Possible duplicate of ${duplicates.map((d) => `${d.full_name} (${d.employee_id})`).join(', ')}`
+        );
+      }
       navigate('/');
     } else {
       if (typeof result.error === 'object') {
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { useNavigate } from 'react-router-dom';
 import employeeService from '../../services/employeeService';
 import { toast } from 'react-toastify';
@@ -11,6 +11,8 @@ const EmployeeList = () => {
   const [employees, setEmployees] = useState([]);
   const [loading, setLoading] = useState(true);
   const [search, setSearch] = useState('');
+  const [searchInput, setSearchInput] = useState('');
+  const [suggestions, setSuggestions] = useState([]);
   const [filterDepartment, setFilterDepartment] = useState('');
   const [filterStatus, setFilterStatus] = useState('');
   const [deleteModal, setDeleteModal] = useState({ show: false, employee: null });
@@ -18,6 +20,7 @@ const EmployeeList = () => {
   const [currentPage, setCurrentPage] = useState(1);
   
   const navigate = useNavigate();
+  const suggestionRequest = useRef(0);
 
   const fetchEmployees = async (page = 1) => {
     setLoading(true);
@@ -52,6 +55,47 @@ const EmployeeList = () => {
     fetchEmployees(currentPage);
   }, [search, filterDepartment, filterStatus, currentPage]);
 
+  // Suggestions come from the autocomplete index while typing; the full
+  // search only runs once typing pauses
+  useEffect(() => {
+    const query = searchInput.trim();
+    const requestId = ++suggestionRequest.current;
+    let suggestTimer = null;
+    if (query) {
+      suggestTimer = setTimeout(async () => {
+        const result = await employeeService.autocomplete(query, 8);
+        // Drop responses that arrive after a newer keystroke
+        if (requestId === suggestionRequest.current) {
+          setSuggestions(result.success ? result.data : []);
+        }
+      }, 150);
+    } else {
+      setSuggestions([]);
+    }
+    const searchTimer = setTimeout(() => applySearch(searchInput), 400);
+
+    return () => {
+      clearTimeout(suggestTimer);
+      clearTimeout(searchTimer);
+    };
+  }, [searchInput]);
+
+  const applySearch = (value) => {
+    if (value !== search) {
+      setSearch(value);
+      setCurrentPage(1);
+    }
+  };
+
+  const handleSearchKeyDown = (e) => {
+    if (e.key === 'Enter') {
+      setSuggestions([]);
+      applySearch(searchInput);
+    } else if (e.key === 'Escape') {
+      setSuggestions([]);
+    }
+  };
+
   const handleDelete = async (employeeId) => {
     const result = await employeeService.delete(employeeId);
     
@@ -104,15 +148,36 @@ const EmployeeList = () => {
       {/* Filters */}
       <div className="card">
         <div className="grid grid-cols-1 md:grid-cols-3 gap-4">
-          <div>
+          <div className="relative">
             <label className="label">Search</label>
             <input
               type="text"
               placeholder="Search by name, email, ID..."
               className="input-field"
-              value={search}
-              onChange={(e) => setSearch(e.target.value)}
+              value={searchInput}
+              onChange={(e) => setSearchInput(e.target.value)}
+              onKeyDown={handleSearchKeyDown}
+              onBlur={() => setTimeout(() => setSuggestions([]), 150)}
             />
+            {suggestions.length > 0 && (
+              <ul className="absolute z-10 mt-1 w-full bg-white border border-gray-200 rounded-lg shadow-lg max-h-64 overflow-y-auto">
+                {suggestions.map((suggestion) => (
+                  <li key={suggestion.id}>
+                    <button
+                      type="button"
+                      className="w-full text-left px-3 py-2 hover:bg-gray-100"
+                      onMouseDown={(e) => e.preventDefault()}
+                      onClick={() => navigate(`/employees/${suggestion.id}`)}
+                    >
+                      <span className="font-medium text-gray-900">{suggestion.full_name}</span>
+                      <span className="ml-2 text-sm text-gray-500">
+                        {suggestion.employee_id} · {suggestion.department}
+                      </span>
+                    </button>
+                  </li>
+                ))}
+              </ul>
+            )}
           </div>
           
           <div>
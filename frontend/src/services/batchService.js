@@ -0,0 +1,20 @@
+import api from "./api";
+
+const batchService = {
+  // Run several API calls in one round-trip.
+  // Each request is { id, method, path, params, body }; paths are absolute,
+  // e.g. "/api/employees/". Responses come back in the same order.
+  run: async (requests, { parallel = false } = {}) => {
+    try {
+      const response = await api.post("/batch/", { requests, parallel });
+      return { success: true, data: response.data.responses };
+    } catch (error) {
+      return {
+        success: false,
+        error: error.response?.data || "Batch request failed",
+      };
+    }
+  },
+};
+
+export default batchService;
@@ -158,6 +158,21 @@ const employeeService = {
     }
   },
 
+  // Autocomplete suggestions for the search box
+  autocomplete: async (query, limit = 10) => {
+    try {
+      const response = await api.get("/employees/autocomplete/", {
+        params: { q: query, limit },
+      });
+      return { success: true, data: response.data };
+    } catch (error) {
+      return {
+        success: false,
+        error: error.response?.data || "Autocomplete failed",
+      };
+    }
+  },
+
   // Advanced search
   search: async (query, filters = {}) => {
     try {